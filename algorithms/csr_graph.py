@@ -0,0 +1,277 @@
+"""
+Compressed sparse row (CSR) graph representation.
+Edges of all vertices are stored in two flat arrays (targets and weights),
+vertex v owns slice [offsets[v], offsets[v + 1]) of them.
+Memory usage is O(V + E) and edges of vertex are read in O(degree).
+
+Usage example:
+-------
+>> g = CSRGraph([0, 2, 3, 3], [1, 2, 2], [4, 1, 2])
+>> len(g)
+3
+>> list(g.edges(0))
+[(1, 4), (2, 1)]
+>> g = CSRGraph.from_adj_list([[(1, 4), (2, 1)], [(2, 2)], []])      # Same graph.
+>> g = CSRGraph.from_adj_matrix([[0, 4, 1], [0, 0, 2], [0, 0, 0]])   # Same graph.
+>> g[0]                                     # Neighbors, same as row of adjacency list of graph traversals.
+array('q', [1, 2])
+
+Unweighted graph has no weights array, every edge weighs 1:
+>> g = CSRGraph.from_adj_list([[1, 2], [2], []])
+>> list(g.edges(0))
+[(1, 1), (2, 1)]
+
+Sharing graph between processes:
+-------
+>> descriptor, blocks = g.to_shared_memory()       # In parent process.
+>> shared_g, shared_blocks = CSRGraph.from_shared_memory(descriptor)    # In child process.
+# Arrays of shared_g are views of the same memory, nothing is copied or pickled
+# except small descriptor. Every process closes it's blocks when done,
+# parent also unlinks them.
+
+Storing graph on disk:
+-------
+>> write_csr_graph('graph.csr', g)
+>> g = read_csr_graph('graph.csr')
+# File is memory-mapped, arrays of g are views of it. Nothing is read until
+# it's accessed, so graph is ready at once and may be larger than RAM.
+# Such graph is accepted by dijkstra() and graph traversals, as any other CSRGraph.
+
+File format: 24 bytes header, then offsets, targets and weights arrays of 8 bytes numbers.
+Header fields: b'CSRG' magic, format version (1 byte), byte order (b'<' or b'>'),
+weights typecode (b'q' for integers, b'd' for floats, b'-' for unweighted graph), 1 padding byte,
+vertices number and edges number (8 bytes unsigned integers).
+"""
+import mmap
+import struct
+import sys
+from array import array
+from itertools import repeat
+from multiprocessing import shared_memory
+
+
+FILE_MAGIC = b'CSRG'
+FILE_VERSION = 1
+_FILE_HEADER = struct.Struct('=4sBccxQQ')
+_BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+
+
+class CSRGraph:
+    """
+    Directed graph in compressed sparse row format.
+    offsets, targets and weights may be any integer-indexed sequences
+    (lists, arrays, memoryviews). If weights is None, graph is unweighted.
+    Supported methods: __init__, __len__, __getitem__, __repr__, edges, degree, reversed,
+    to_shared_memory, from_adj_list, from_adj_matrix, from_shared_memory.
+    """
+    def __init__(self, offsets, targets, weights=None):
+        if not len(offsets) or offsets[0] != 0 or offsets[-1] != len(targets):
+            raise ValueError('Offsets must start with 0 and end with number of edges.')
+        if weights is not None and len(weights) != len(targets):
+            raise ValueError('Targets and weights must have equal length.')
+
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._reversed = None
+
+    def __len__(self):
+        """Returns number of vertices."""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, vertex):
+        """Returns sequence of vertex neighbors, so graph can be used as adjacency list."""
+        return self.targets[self.offsets[vertex]:self.offsets[vertex + 1]]
+
+    def __repr__(self):
+        return 'CSRGraph(vertices={0}, edges={1})'.format(len(self), len(self.targets))
+
+    def edges(self, vertex):
+        """Returns iterator over (neighbor, weight) pairs of vertex."""
+        begin, end = self.offsets[vertex], self.offsets[vertex + 1]
+        if self.weights is None:
+            return zip(self.targets[begin:end], repeat(1))
+        return zip(self.targets[begin:end], self.weights[begin:end])
+
+    def degree(self, vertex):
+        """Returns number of outgoing edges of vertex."""
+        return self.offsets[vertex + 1] - self.offsets[vertex]
+
+    def reversed(self):
+        """
+        Returns graph with all edges reversed. O(V + E) time complexity.
+        Edges are grouped by target with counting sort, so for each vertex
+        incoming edges keep order of their sources.
+        Result is cached, as graph is not expected to be changed.
+        """
+        if self._reversed is None:
+            self._reversed = self._build_reversed()
+        return self._reversed
+
+    def _build_reversed(self):
+        offsets = array('q', bytes(8 * len(self.offsets)))
+        for target in self.targets:
+            offsets[target + 1] += 1
+        for vertex in range(len(self)):
+            offsets[vertex + 1] += offsets[vertex]
+
+        # Next free position for incoming edge of every vertex.
+        positions = array('q', offsets[:-1])
+        targets = array('q', bytes(8 * len(self.targets)))
+        weights = None if self.weights is None else array(_typecode(self.weights), bytes(8 * len(self.weights)))
+        for source in range(len(self)):
+            for target, weight in self.edges(source):
+                targets[positions[target]] = source
+                if weights is not None:
+                    weights[positions[target]] = weight
+                positions[target] += 1
+
+        return CSRGraph(offsets, targets, weights)
+
+    def to_shared_memory(self):
+        """
+        Copies offsets, targets and weights to new shared memory blocks.
+        Returns picklable descriptor for from_shared_memory() and list of blocks.
+        Caller is responsible for closing and unlinking blocks.
+        """
+        descriptor, blocks = [], []
+        for values in (self.offsets, self.targets, self.weights):
+            if values is None:
+                descriptor.append(None)
+                continue
+
+            typecode = _typecode(values)
+            values = array(typecode, values)
+            # Shared memory block can't be empty.
+            block = shared_memory.SharedMemory(create=True, size=max(len(values) * values.itemsize, values.itemsize))
+            block.buf[:len(values) * values.itemsize] = values.tobytes()
+            descriptor.append((block.name, typecode, len(values)))
+            blocks.append(block)
+
+        return tuple(descriptor), blocks
+
+    @classmethod
+    def from_shared_memory(cls, descriptor):
+        """
+        Attaches to shared memory blocks, created by to_shared_memory().
+        Returns graph, which arrays are views of blocks, and list of blocks.
+        Graph must be deleted before blocks are closed.
+        """
+        arrays, blocks = [], []
+        for array_descriptor in descriptor:
+            if array_descriptor is None:
+                arrays.append(None)
+                continue
+
+            name, typecode, length = array_descriptor
+            block = attach_shared_memory(name)
+            arrays.append(block.buf.cast(typecode)[:length])
+            blocks.append(block)
+
+        return cls(*arrays), blocks
+
+    @classmethod
+    def from_adj_list(cls, adj_list):
+        """
+        Builds graph from adjacency list of (neighbor, weight) pairs,
+        or from adjacency list of neighbors (graph is unweighted then).
+        """
+        first_row = next((row for row in adj_list if len(row)), None)
+        if first_row is not None and not isinstance(first_row[0], (tuple, list)):
+            offsets, targets = [0], []
+            for row in adj_list:
+                targets.extend(row)
+                offsets.append(len(targets))
+            return cls(array('q', offsets), array('q', targets))
+
+        offsets, targets, weights = [0], [], []
+        for row in adj_list:
+            for neighbor, weight in row:
+                targets.append(neighbor)
+                weights.append(weight)
+            offsets.append(len(targets))
+
+        return cls(array('q', offsets), array('q', targets), _weights_array(weights))
+
+    @classmethod
+    def from_adj_matrix(cls, adj_matrix):
+        """Builds graph from adjacency matrix. Zero cells are treated as absent edges."""
+        return cls.from_adj_list(
+            [[(neighbor, weight) for neighbor, weight in enumerate(row) if weight] for row in adj_matrix]
+        )
+
+
+def write_csr_graph(path, graph):
+    """
+    Writes graph to binary file (see module docstring for format).
+    graph is CSRGraph or adjacency list, accepted by CSRGraph.from_adj_list().
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adj_list(graph)
+
+    weights_typecode = '-' if graph.weights is None else _typecode(graph.weights)
+    with open(path, 'wb') as file:
+        file.write(_FILE_HEADER.pack(
+            FILE_MAGIC, FILE_VERSION, _BYTE_ORDER, weights_typecode.encode(), len(graph), len(graph.targets)
+        ))
+        array('q', graph.offsets).tofile(file)
+        array('q', graph.targets).tofile(file)
+        if graph.weights is not None:
+            array(weights_typecode, graph.weights).tofile(file)
+
+
+def read_csr_graph(path):
+    """
+    Memory-maps binary file, written by write_csr_graph(), and returns CSRGraph,
+    which arrays are read-only views of the file. Nothing is copied.
+    Raises ValueError if file is not a CSR graph file, or was written on a machine
+    with different byte order.
+    """
+    with open(path, 'rb') as file:
+        # File may be closed right after mapping, map stays valid.
+        mapped_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapped_file) < _FILE_HEADER.size:
+        raise ValueError('File is too short for a CSR graph file.')
+
+    magic, version, byte_order, weights_typecode, vertices, edges = _FILE_HEADER.unpack_from(mapped_file)
+    if magic != FILE_MAGIC or version != FILE_VERSION:
+        raise ValueError('Not a CSR graph file, or unsupported format version.')
+    if byte_order != _BYTE_ORDER:
+        raise ValueError('CSR graph file was written with different byte order.')
+
+    weights_typecode = weights_typecode.decode()
+    lengths = [vertices + 1, edges] + ([] if weights_typecode == '-' else [edges])
+    if len(mapped_file) != _FILE_HEADER.size + 8 * sum(lengths):
+        raise ValueError('CSR graph file size does not match it\'s header.')
+
+    # Views keep the map alive, it's closed when graph is deleted.
+    view, position, arrays = memoryview(mapped_file), _FILE_HEADER.size, []
+    for length, typecode in zip(lengths, ['q', 'q', weights_typecode]):
+        arrays.append(view[position:position + 8 * length].cast(typecode))
+        position += 8 * length
+
+    return CSRGraph(*arrays)
+
+
+def _typecode(weights):
+    # Integer weights are kept as integers, so path weights don't turn into floats.
+    # Arrays and memoryviews already know type of their items.
+    typecode = getattr(weights, 'typecode', None) or getattr(weights, 'format', None)
+    if typecode in ('q', 'd'):
+        return typecode
+    return 'q' if all(isinstance(weight, int) for weight in weights) else 'd'
+
+
+def _weights_array(weights):
+    return array(_typecode(weights), weights)
+
+
+def attach_shared_memory(name):
+    """
+    Attaches to existing shared memory block by it's name.
+    Child processes share resource tracker of the parent (with any start method),
+    so block stays registered until creating process unlinks it, and is cleaned up
+    by the tracker if that process crashes.
+    """
+    return shared_memory.SharedMemory(name=name)
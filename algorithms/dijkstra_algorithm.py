@@ -1,51 +1,753 @@
 """
 Dijkstra algorithm implementation.
-Accepts graph as adjacency matrix.
+Accepts graph in one of the following formats:
+* adjacency matrix - zero cells are treated as absent edges, O(V²) memory;
+* adjacency list of (neighbor, weight) pairs - O(V + E) memory;
+* CSRGraph (see csr_graph module) - O(V + E) memory in flat arrays.
+Edges of vertex are read in O(degree) for both sparse formats.
+
+Three engines are available for choosing next vertex to visit:
+'set'   - linear scan over set of unvisited vertices, O(V²) in total.
+'heap'  - binary heap frontier with lazy deletion, O((V + E) log V) in total.
+'numpy' - graph is stored as dense NumPy matrix, whole row of it is relaxed at once
+          and next vertex is picked by masked argmin. O(V²) in total, but the loops
+          run inside NumPy, so it's the fastest one for dense graphs. Requires numpy.
+          Adjacency matrix may be passed as NumPy array to avoid conversion.
+All engines return equal results: among vertices with equal weights
+the lowest one is always visited first, so ties between equally short paths
+are broken the same way.
+
+During the search only predecessor of every vertex is stored, paths are
+reconstructed from predecessors array afterwards. With lazy_paths=True
+reconstruction happens on demand, when path to particular vertex is requested.
+
+If finishing vertex is given, bidirectional=True runs two searches at once:
+forward one from starting vertex and backward one (over reversed edges)
+from finishing vertex. They stop when meet in the middle, which roughly
+halves number of visited vertices.
+
+a_star() is goal-directed version of point-to-point search. Vertices are
+visited in order of (path weight + heuristic estimate of remaining weight).
+Heuristic must never overestimate remaining weight, otherwise found path
+may be not the shortest one.
+
+Usage example:
+-------
+>> coordinates = [(0, 0), (1, 0), (1, 1)]
+>> a_star([[(1, 1)], [(2, 1)], []], 0, 2, euclidean_heuristic(coordinates))
+((0, 1, 2), 2)
+
+batch_dijkstra() answers many (start, finish) queries against the same graph
+in a pool of worker processes. Graph is converted to CSRGraph and placed
+in shared memory once, so it's never pickled per query.
+
+all_pairs_shortest_paths() builds table of shortest path weights between all
+vertices: vectorized Floyd-Warshall algorithm for adjacency matrices (if numpy
+is installed), Johnson's algorithm (heap Dijkstra from every vertex) otherwise.
+
+ShortestPathIndex memoizes shortest path trees for repeated queries and
+repairs them on edge updates instead of recomputing.
+
+iter_dijkstra() yields (vertex, weight, path) records one by one, as vertices
+are visited, so results can be streamed or search can be stopped early.
+
+Usage example:
+-------
+>> index = ShortestPathIndex([[(1, 4), (2, 1)], [], [(1, 2)]])
+>> index.query(0, 1)
+((0, 2, 1), 3)
+>> index.update_edge(0, 1, 2)               # Only vertex 1 of cached tree is updated.
+>> index.query(0, 1)
+((0, 1), 2)
 """
+import heapq
+import math
+from collections import OrderedDict
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from algorithms.csr_graph import CSRGraph
 
 
-def dijkstra(adj_matrix, start, finish=None):
+ENGINES = ('set', 'heap', 'numpy')
+
+
+class PredecessorPaths:
+    """
+    Read-only sequence of shortest paths from starting vertex,
+    lazily reconstructed from predecessors array.
+    Getting path to vertex costs O(path length), nothing is cached.
+    Path to unreachable vertex is (start, ), same as in dijkstra() output.
+    Supported methods: __init__, __len__, __getitem__, __iter__.
+    """
+    def __init__(self, start, predecessors):
+        self.start = start
+        self.predecessors = predecessors
+
+    def __len__(self):
+        return len(self.predecessors)
+
+    def __getitem__(self, vertex):
+        """Walks from vertex back to start by predecessors and returns path as a tuple."""
+        path = [vertex]
+        while self.predecessors[vertex] is not None:
+            vertex = self.predecessors[vertex]
+            path.append(vertex)
+
+        if vertex != self.start:
+            return (self.start, )
+
+        return tuple(reversed(path))
+
+    def __iter__(self):
+        """Yields path to each vertex, in vertices order."""
+        for vertex in range(len(self)):
+            yield self[vertex]
+
+
+def dijkstra(graph, start, finish=None, engine='set', lazy_paths=False, bidirectional=False):
     """
     If finish is not given:
     Returns list with shortest paths to each vertex from starting one and list with their weights.
     Vertices number are indexes in both lists.
+    If lazy_paths is True, PredecessorPaths is returned instead of list of paths.
     Else:
     Returns shortest path and it's weight from starting vertex to finishing one.
 
+    engine is one of ENGINES, ValueError is raised otherwise.
+    bidirectional search requires finish and always uses heap frontiers, so engine is ignored for it.
+
     (!) Uncomment appropriate 'return' lines in code for more convenient string output.
     """
-    paths = [(start, )]*len(adj_matrix)
-    paths_weights = [float('inf') if i != start else 0 for i in range(len(adj_matrix))]
+    if bidirectional:
+        if finish is None:
+            raise ValueError('Bidirectional search requires finishing vertex.')
+        return _bidirectional_search(graph, start, finish)
+
+    if engine == 'set':
+        predecessors, paths_weights = _set_engine(graph, start, finish)
+    elif engine == 'heap':
+        predecessors, paths_weights = _heap_engine(graph, start, finish)
+    elif engine == 'numpy':
+        predecessors, paths_weights = _numpy_engine(graph, start, finish)
+    else:
+        raise ValueError('Unknown engine: {0}. Expected one of {1}.'.format(engine, ENGINES))
+
+    paths = PredecessorPaths(start, predecessors)
+    if finish is None and not lazy_paths:
+        paths = list(paths)
+
+    "(!) Uncomment next line for more convenient string output."
+    # return friendly_output(graph, start, paths, paths_weights, finish)
+
+    if finish is not None:
+        return paths[finish], paths_weights[finish]
+    else:
+        return paths, paths_weights
+
+
+def _is_adj_list(graph):
+    """
+    Rows of adjacency list contain pairs, while rows of adjacency matrix contain numbers.
+    Graph without edges in all rows can only be an adjacency list.
+    """
+    first_row = next((row for row in graph if len(row)), None)
+    return first_row is None or isinstance(first_row[0], (tuple, list))
+
+
+def _get_edges_function(graph):
+    """
+    Returns function, that accepts vertex and returns iterable
+    of (neighbor, weight) pairs for given graph format.
+    """
+    if isinstance(graph, CSRGraph):
+        return graph.edges
+
+    if _is_adj_list(graph):
+        return graph.__getitem__
+
+    return lambda vertex: [(neighbor, weight) for neighbor, weight in enumerate(graph[vertex]) if weight]
+
+
+def _get_reverse_edges_function(graph):
+    """
+    Returns function, that accepts vertex and returns iterable
+    of (predecessor, weight) pairs for given graph format.
+    For sparse formats reversed graph is built once, in O(V + E).
+    """
+    if isinstance(graph, CSRGraph):
+        return graph.reversed().edges
+
+    if _is_adj_list(graph):
+        reversed_adj_list = [[] for _ in range(len(graph))]
+        for parent_vertex, row in enumerate(graph):
+            for child_vertex, weight in row:
+                reversed_adj_list[child_vertex].append((parent_vertex, weight))
+        return reversed_adj_list.__getitem__
+
+    # Incoming edges of vertex are the column of adjacency matrix.
+    return lambda vertex: [(parent, row[vertex]) for parent, row in enumerate(graph) if row[vertex]]
+
+
+def _set_engine(graph, start, finish):
+    """
+    Picks next vertex by linear scan over unvisited ones.
+    Stops as soon as finishing vertex is visited.
+    """
+    edges = _get_edges_function(graph)
+    predecessors = [None]*len(graph)
+    paths_weights = [float('inf') if i != start else 0 for i in range(len(graph))]
     unvisited, visited = {start}, set()
 
     while unvisited:
-        parent_vertex = min(unvisited, key=lambda vertex: paths_weights[vertex])
+        # Ties are broken by vertex number, as in other engines.
+        parent_vertex = min(unvisited, key=lambda vertex: (paths_weights[vertex], vertex))
         if parent_vertex == finish:
-            "(!) Uncomment next line for more convenient string output."
-            # return friendly_output(adj_matrix, start, paths, paths_weights, finish)
-
-            return paths[finish], paths_weights[finish]
+            break
 
         unvisited.remove(parent_vertex)
         visited.add(parent_vertex)
 
-        for child_vertex in range(len(adj_matrix)):
-            parent_child_edge_weight = adj_matrix[parent_vertex][child_vertex]
-            if child_vertex not in visited and parent_child_edge_weight:
+        for child_vertex, parent_child_edge_weight in edges(parent_vertex):
+            if child_vertex not in visited:
                 unvisited.add(child_vertex)
                 possible_new_weight = paths_weights[parent_vertex] + parent_child_edge_weight
 
                 if possible_new_weight < paths_weights[child_vertex]:
                     paths_weights[child_vertex] = possible_new_weight
-                    paths[child_vertex] = paths[parent_vertex] + (child_vertex, )
+                    predecessors[child_vertex] = parent_vertex
 
-    "(!) Uncomment next line for more convenient string output."
-    # return friendly_output(adj_matrix, start, paths, paths_weights, finish)
+    return predecessors, paths_weights
 
-    if finish is not None:
-        return paths[finish], paths_weights[finish]
+
+def _heap_engine(graph, start, finish):
+    """
+    Picks next vertex from binary heap of (weight, vertex) items.
+    Vertex is pushed again every time it's weight decreases, so heap may contain
+    outdated items - they are skipped when popped (lazy deletion).
+    Stops as soon as finishing vertex is popped.
+    """
+    predecessors = [None]*len(graph)
+    paths_weights = [float('inf') if i != start else 0 for i in range(len(graph))]
+
+    for vertex, _ in _heap_search(_get_edges_function(graph), predecessors, paths_weights, [(0, start)]):
+        if vertex == finish:
+            break
+
+    return predecessors, paths_weights
+
+
+def _heap_search(edges, predecessors, paths_weights, frontier):
+    """
+    Search loop of heap engine, shared by it, iter_dijkstra() and ShortestPathIndex.
+    Pops vertices from frontier heap of (weight, vertex) items and relaxes their edges
+    (edges is a function, returning (neighbor, weight) pairs of vertex),
+    updating predecessors and paths_weights in place.
+    Yields (vertex, weight) of every visited vertex before it's edges are relaxed,
+    so caller may stop the search right at the vertex it needs.
+    """
+    while frontier:
+        parent_weight, parent_vertex = heapq.heappop(frontier)
+        if parent_weight > paths_weights[parent_vertex]:
+            # Outdated item, vertex is already visited with lower weight.
+            continue
+
+        yield parent_vertex, parent_weight
+
+        for child_vertex, parent_child_edge_weight in edges(parent_vertex):
+            possible_new_weight = parent_weight + parent_child_edge_weight
+
+            # Visited vertices are never updated here, as their weights can't decrease.
+            if possible_new_weight < paths_weights[child_vertex]:
+                paths_weights[child_vertex] = possible_new_weight
+                predecessors[child_vertex] = parent_vertex
+                heapq.heappush(frontier, (possible_new_weight, child_vertex))
+
+
+def _bidirectional_search(graph, start, finish):
+    """
+    Forward search from start and backward search from finish, both with heap frontiers.
+    On each step the side with smaller frontier is expanded.
+    Every time vertex is reached by both searches, path through it becomes a candidate.
+    Search stops, when sum of both frontiers minimal weights is not less than
+    the best candidate weight: no shorter path can be found after that.
+    Returns shortest path and it's weight, or ((start, ), inf) if there is no path.
+    """
+    edges = (_get_edges_function(graph), _get_reverse_edges_function(graph))
+    # Index 0 is for forward search, index 1 is for backward search.
+    # Backward predecessor of vertex is actually it's successor on the way to finish.
+    paths_weights = ([float('inf')]*len(graph), [float('inf')]*len(graph))
+    predecessors = ([None]*len(graph), [None]*len(graph))
+    paths_weights[0][start], paths_weights[1][finish] = 0, 0
+    frontiers = ([(0, start)], [(0, finish)])
+
+    best_weight, meeting_vertex = (0, start) if start == finish else (float('inf'), None)
+
+    while frontiers[0] and frontiers[1] and frontiers[0][0][0] + frontiers[1][0][0] < best_weight:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        weights, other_weights = paths_weights[side], paths_weights[1 - side]
+
+        parent_weight, parent_vertex = heapq.heappop(frontiers[side])
+        if parent_weight > weights[parent_vertex]:
+            # Outdated item, vertex is already visited with lower weight.
+            continue
+
+        for child_vertex, parent_child_edge_weight in edges[side](parent_vertex):
+            possible_new_weight = parent_weight + parent_child_edge_weight
+
+            if possible_new_weight < weights[child_vertex]:
+                weights[child_vertex] = possible_new_weight
+                predecessors[side][child_vertex] = parent_vertex
+                heapq.heappush(frontiers[side], (possible_new_weight, child_vertex))
+
+                if possible_new_weight + other_weights[child_vertex] < best_weight:
+                    best_weight = possible_new_weight + other_weights[child_vertex]
+                    meeting_vertex = child_vertex
+
+    if meeting_vertex is None:
+        return (start, ), float('inf')
+
+    forward_part = PredecessorPaths(start, predecessors[0])[meeting_vertex]
+    backward_part = PredecessorPaths(finish, predecessors[1])[meeting_vertex]
+    return forward_part + tuple(reversed(backward_part))[1:], best_weight
+
+
+def _numpy_engine(graph, start, finish):
+    """
+    Keeps weights of edges as dense matrix, where absent edges weigh infinity.
+    On each step picks unvisited vertex with the lowest weight by argmin
+    and relaxes all it's edges with single vectorized comparison.
+    Stops as soon as finishing vertex is visited, or all reachable ones are.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("'numpy' engine requires numpy to be installed.")
+
+    if isinstance(graph, CSRGraph) or _is_adj_list(graph):
+        edges_weights = np.full((len(graph), len(graph)), np.inf)
+        integer_weights = True
+        edges = _get_edges_function(graph)
+        for parent_vertex in range(len(graph)):
+            for child_vertex, weight in edges(parent_vertex):
+                edges_weights[parent_vertex, child_vertex] = min(edges_weights[parent_vertex, child_vertex], weight)
+                integer_weights = integer_weights and isinstance(weight, int)
     else:
-        return paths, paths_weights
+        # NumPy array is used as is, python lists are converted.
+        adj_matrix = np.asarray(graph)
+        edges_weights = np.where(adj_matrix != 0, adj_matrix, np.inf)
+        integer_weights = adj_matrix.dtype.kind in 'iub'
+
+    predecessors = np.full(len(graph), -1)
+    paths_weights = np.full(len(graph), np.inf)
+    paths_weights[start] = 0
+    visited = np.zeros(len(graph), dtype=bool)
+
+    for _ in range(len(graph)):
+        # argmin returns the first of equal weights, so the lowest vertex is picked, as in other engines.
+        parent_vertex = int(np.argmin(np.where(visited, np.inf, paths_weights)))
+        if visited[parent_vertex] or paths_weights[parent_vertex] == np.inf or parent_vertex == finish:
+            break
+
+        visited[parent_vertex] = True
+        possible_new_weights = paths_weights[parent_vertex] + edges_weights[parent_vertex]
+        improved = (possible_new_weights < paths_weights) & ~visited
+        paths_weights[improved] = possible_new_weights[improved]
+        predecessors[improved] = parent_vertex
+
+    # Results are converted back to python lists, so they're equal to other engines ones.
+    weight_type = int if integer_weights else float
+    return (
+        [int(vertex) if vertex >= 0 else None for vertex in predecessors],
+        [weight_type(weight) if weight != np.inf else float('inf') for weight in paths_weights]
+    )
+
+
+def iter_dijkstra(graph, start):
+    """
+    Generator version of heap engine search.
+    Yields (vertex, path weight, path) for each reachable vertex, in order
+    of visiting, i.e. in non-decreasing weights order, starting with (start, 0, (start, )).
+    Unreachable vertices are not yielded.
+    Only predecessors are stored, path is reconstructed right before it's yielded.
+    """
+    paths = PredecessorPaths(start, [None]*len(graph))
+    paths_weights = [float('inf') if i != start else 0 for i in range(len(graph))]
+
+    edges = _get_edges_function(graph)
+    for vertex, path_weight in _heap_search(edges, paths.predecessors, paths_weights, [(0, start)]):
+        yield vertex, path_weight, paths[vertex]
+
+
+def a_star(graph, start, finish, heuristic=None):
+    """
+    Returns shortest path and it's weight from starting vertex to finishing one,
+    same as dijkstra(graph, start, finish).
+    heuristic is a function, that accepts vertex and finishing vertex and returns
+    estimated weight of path between them. Defaults to zero_heuristic,
+    which turns search into plain Dijkstra algorithm.
+    """
+    if heuristic is None:
+        heuristic = zero_heuristic
+
+    edges = _get_edges_function(graph)
+    predecessors = [None]*len(graph)
+    paths_weights = [float('inf') if i != start else 0 for i in range(len(graph))]
+    # Items are (estimated full path weight, path weight, vertex).
+    frontier = [(heuristic(start, finish), 0, start)]
+
+    while frontier:
+        _, parent_weight, parent_vertex = heapq.heappop(frontier)
+        if parent_weight > paths_weights[parent_vertex]:
+            # Outdated item, vertex is already reached with lower weight.
+            continue
+
+        if parent_vertex == finish:
+            break
+
+        for child_vertex, parent_child_edge_weight in edges(parent_vertex):
+            possible_new_weight = parent_weight + parent_child_edge_weight
+
+            if possible_new_weight < paths_weights[child_vertex]:
+                paths_weights[child_vertex] = possible_new_weight
+                predecessors[child_vertex] = parent_vertex
+                heapq.heappush(frontier, (
+                    possible_new_weight + heuristic(child_vertex, finish), possible_new_weight, child_vertex
+                ))
+
+    return PredecessorPaths(start, predecessors)[finish], paths_weights[finish]
+
+
+def zero_heuristic(vertex, finish):
+    """Estimates every remaining weight as 0. Always admissible."""
+    return 0
+
+
+def euclidean_heuristic(coordinates):
+    """
+    Accepts sequence of vertices coordinates and returns heuristic function,
+    that estimates remaining weight as straight-line distance to finishing vertex.
+    Admissible if no edge weight is less than distance between it's vertices.
+    """
+    def heuristic(vertex, finish):
+        return math.dist(coordinates[vertex], coordinates[finish])
+
+    return heuristic
+
+
+def manhattan_heuristic(coordinates):
+    """
+    Accepts sequence of vertices coordinates and returns heuristic function,
+    that estimates remaining weight as sum of absolute coordinates differences.
+    Admissible for grid graphs, where moves are made along the axes only.
+    """
+    def heuristic(vertex, finish):
+        return sum(abs(a - b) for a, b in zip(coordinates[vertex], coordinates[finish]))
+
+    return heuristic
+
+
+def batch_dijkstra(graph, queries, max_workers=None):
+    """
+    Accepts graph and sequence of (start, finish) queries, finish may be None.
+    Returns list of dijkstra(graph, start, finish) results in queries order.
+    Queries with equal starting vertex are answered by single search,
+    each full traversal query still gets it's own paths and paths_weights lists.
+    max_workers is passed to ProcessPoolExecutor.
+    """
+    # Finishing vertices of every starting one, None means full traversal.
+    finishes = {}
+    for start, finish in queries:
+        finishes.setdefault(start, set()).add(finish)
+    tasks = [(start, tuple(start_finishes)) for start, start_finishes in finishes.items()]
+
+    answers = dict(zip(finishes, _map_over_shared_graph(_to_csr_graph(graph), _answer_batch_task, tasks, max_workers)))
+
+    results = []
+    for start, finish in queries:
+        result = answers[start][finish]
+        results.append(result if finish is not None else (list(result[0]), list(result[1])))
+    return results
+
+
+def all_pairs_shortest_paths(graph, method=None, max_workers=None):
+    """
+    Returns distance matrix as list of array('d') rows: row[finish] of start row
+    is the weight of shortest path from start to finish (inf if there is no path).
+    Negative edge weights are allowed, ValueError is raised if graph has a negative cycle.
+    method is 'floyd-warshall' (requires numpy, O(V³) vectorized, O(V²) memory)
+    or 'johnson' (O(V (V + E) log V)). If not given, Floyd-Warshall is used
+    for adjacency matrices if numpy is installed, Johnson's algorithm otherwise.
+    If max_workers is given, Dijkstra searches of Johnson's algorithm run in process pool.
+    """
+    if method is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        dense = numpy is not None and not isinstance(graph, CSRGraph) and not _is_adj_list(graph)
+        method = 'floyd-warshall' if dense else 'johnson'
+
+    if method == 'floyd-warshall':
+        return _floyd_warshall(graph)
+    elif method == 'johnson':
+        return _johnson(graph, max_workers)
+    else:
+        raise ValueError("Unknown method: {0}. Expected 'floyd-warshall' or 'johnson'.".format(method))
+
+
+def _floyd_warshall(graph):
+    """
+    After k-th step distances[i, j] is the weight of shortest path from i to j,
+    which goes only through vertices lower than k. Each step updates the whole matrix
+    at once, via vertex k: distances = min(distances, distances[:, k] + distances[k, :]).
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError('Floyd-Warshall algorithm requires numpy to be installed.')
+
+    if isinstance(graph, CSRGraph) or _is_adj_list(graph):
+        distances = np.full((len(graph), len(graph)), np.inf)
+        edges = _get_edges_function(graph)
+        for parent_vertex in range(len(graph)):
+            for child_vertex, weight in edges(parent_vertex):
+                distances[parent_vertex, child_vertex] = min(distances[parent_vertex, child_vertex], weight)
+    else:
+        adj_matrix = np.asarray(graph)
+        distances = np.where(adj_matrix != 0, adj_matrix, np.inf).astype(float)
+
+    np.fill_diagonal(distances, np.minimum(distances.diagonal(), 0))
+    for vertex in range(len(graph)):
+        np.minimum(distances, distances[:, vertex, None] + distances[None, vertex, :], out=distances)
+
+    if (distances.diagonal() < 0).any():
+        raise ValueError('Graph contains a negative cycle.')
+
+    return [array('d', row.tobytes()) for row in distances]
+
+
+def _johnson(graph, max_workers):
+    """
+    Reweights edges with vertices potentials: weight + potential[parent] - potential[child].
+    New weights are not negative, so Dijkstra algorithm can be run from every vertex.
+    Weights of paths are changed by potential[start] - potential[finish] only,
+    so shortest paths stay the same and their real weights are restored afterwards.
+    """
+    graph = _to_csr_graph(graph)
+    potentials = _bellman_ford_potentials(graph)
+
+    if any(potentials):
+        weights = [
+            weight + potentials[parent_vertex] - potentials[child_vertex]
+            for parent_vertex in range(len(graph))
+            for child_vertex, weight in graph.edges(parent_vertex)
+        ]
+        graph = CSRGraph(graph.offsets, graph.targets, weights)
+
+    if max_workers is None:
+        rows = [_shortest_paths_weights(graph, start) for start in range(len(graph))]
+    else:
+        rows = _map_over_shared_graph(graph, _answer_all_pairs_task, range(len(graph)), max_workers)
+
+    for start, row in enumerate(rows):
+        for finish in range(len(graph)):
+            row[finish] += potentials[finish] - potentials[start]
+
+    return rows
+
+
+def _bellman_ford_potentials(graph):
+    """
+    Returns weights of shortest paths from virtual vertex, connected to every vertex
+    with zero weight edge. Raises ValueError if graph has a negative cycle.
+    """
+    potentials = [0]*len(graph)
+    if graph.weights is None or all(weight >= 0 for weight in graph.weights):
+        return potentials
+
+    for _ in range(len(graph)):
+        updated = False
+        for parent_vertex in range(len(graph)):
+            for child_vertex, weight in graph.edges(parent_vertex):
+                if potentials[parent_vertex] + weight < potentials[child_vertex]:
+                    potentials[child_vertex] = potentials[parent_vertex] + weight
+                    updated = True
+
+        if not updated:
+            return potentials
+
+    raise ValueError('Graph contains a negative cycle.')
+
+
+def _shortest_paths_weights(graph, start):
+    return array('d', dijkstra(graph, start, engine='heap', lazy_paths=True)[1])
+
+
+def _to_csr_graph(graph):
+    if isinstance(graph, CSRGraph):
+        return graph
+    elif _is_adj_list(graph):
+        return CSRGraph.from_adj_list(graph)
+    else:
+        return CSRGraph.from_adj_matrix(graph)
+
+
+def _map_over_shared_graph(graph, function, tasks, max_workers):
+    """
+    Places CSRGraph in shared memory and maps function over tasks in process pool.
+    In worker processes function reads graph from _batch_graph.
+    Returns list of results in tasks order.
+    """
+    descriptor, blocks = graph.to_shared_memory()
+    try:
+        with ProcessPoolExecutor(max_workers, initializer=_attach_batch_graph, initargs=(descriptor, )) as executor:
+            return list(executor.map(function, tasks, chunksize=16))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+# Graph and it's shared memory blocks, attached in worker process of _map_over_shared_graph() pool.
+# Both are kept until process exits.
+_batch_graph, _batch_blocks = None, None
+
+
+def _attach_batch_graph(descriptor):
+    global _batch_graph, _batch_blocks
+    _batch_graph, _batch_blocks = CSRGraph.from_shared_memory(descriptor)
+
+
+def _answer_all_pairs_task(start):
+    return _shortest_paths_weights(_batch_graph, start)
+
+
+def _answer_batch_task(task):
+    """Returns dict with (finish, dijkstra result) items for single starting vertex."""
+    start, finishes = task
+    if len(finishes) == 1:
+        return {finishes[0]: dijkstra(_batch_graph, start, finishes[0], engine='heap')}
+
+    paths, paths_weights = dijkstra(_batch_graph, start, engine='heap', lazy_paths=True)
+    return {
+        finish: (list(paths), paths_weights) if finish is None else (paths[finish], paths_weights[finish])
+        for finish in finishes
+    }
+
+
+class ShortestPathIndex:
+    """
+    Answers shortest path queries, same as dijkstra(graph, start, finish).
+    Shortest path tree (predecessors and weights arrays) of every queried starting
+    vertex is cached, at most max_trees of them. Least recently used tree is dropped first.
+    Graph is copied into adjacency dicts, so it's edges can be updated by update_edge(),
+    which repairs only affected part of every cached tree.
+    Supported methods: __init__, __len__, __contains__, query, update_edge.
+    """
+    def __init__(self, graph, max_trees=128):
+        edges = _get_edges_function(graph)
+        # Outgoing and incoming edges of every vertex as {neighbor: weight} dicts.
+        self._out_edges = [{} for _ in range(len(graph))]
+        self._in_edges = [{} for _ in range(len(graph))]
+        for parent_vertex in range(len(graph)):
+            for child_vertex, weight in edges(parent_vertex):
+                # Only the lightest of parallel edges matters.
+                if weight < self._out_edges[parent_vertex].get(child_vertex, float('inf')):
+                    self._out_edges[parent_vertex][child_vertex] = weight
+                    self._in_edges[child_vertex][parent_vertex] = weight
+
+        self._max_trees = max_trees
+        self._trees = OrderedDict()
+
+    def __len__(self):
+        """Returns number of cached trees."""
+        return len(self._trees)
+
+    def __contains__(self, start):
+        """Checks if tree of starting vertex is cached."""
+        return start in self._trees
+
+    def query(self, start, finish=None, lazy_paths=False):
+        """Returns the same as dijkstra(graph, start, finish, lazy_paths=lazy_paths)."""
+        predecessors, paths_weights = self._get_tree(start)
+        if finish is not None:
+            return PredecessorPaths(start, predecessors)[finish], paths_weights[finish]
+
+        # Copies are returned, so cached tree can't be changed outside.
+        paths = PredecessorPaths(start, list(predecessors))
+        return (paths if lazy_paths else list(paths)), list(paths_weights)
+
+    def update_edge(self, parent_vertex, child_vertex, weight=None):
+        """
+        Sets weight of edge between given vertices, adding edge if it's absent.
+        If weight is None, edge is removed.
+        Cached trees are repaired:
+        * if edge became lighter, child vertex and it's descendants are relaxed further from it;
+        * if edge of the tree became heavier or was removed, subtree under it is detached
+          and settled again from the rest of the tree.
+        """
+        old_weight = self._out_edges[parent_vertex].get(child_vertex)
+        if weight is None:
+            self._out_edges[parent_vertex].pop(child_vertex, None)
+            self._in_edges[child_vertex].pop(parent_vertex, None)
+        else:
+            self._out_edges[parent_vertex][child_vertex] = weight
+            self._in_edges[child_vertex][parent_vertex] = weight
+
+        for predecessors, paths_weights in self._trees.values():
+            if weight is not None and paths_weights[parent_vertex] + weight < paths_weights[child_vertex]:
+                paths_weights[child_vertex] = paths_weights[parent_vertex] + weight
+                predecessors[child_vertex] = parent_vertex
+                self._settle(predecessors, paths_weights, [(paths_weights[child_vertex], child_vertex)])
+
+            elif old_weight is not None and predecessors[child_vertex] == parent_vertex and \
+                    (weight is None or weight > old_weight):
+                self._repair_subtree(predecessors, paths_weights, child_vertex)
+
+    def _get_tree(self, start):
+        if start in self._trees:
+            self._trees.move_to_end(start)
+        else:
+            # Tree is grown right over adjacency dicts, graph is not copied.
+            predecessors = [None]*len(self._out_edges)
+            paths_weights = [float('inf') if i != start else 0 for i in range(len(self._out_edges))]
+            self._settle(predecessors, paths_weights, [(0, start)])
+            self._trees[start] = (predecessors, paths_weights)
+            if len(self._trees) > self._max_trees:
+                self._trees.popitem(last=False)
+
+        return self._trees[start]
+
+    def _repair_subtree(self, predecessors, paths_weights, root):
+        """
+        Resets weights of root and all it's descendants in the tree, then
+        settles them again, starting from their best incoming edges from the rest of the tree.
+        """
+        subtree, stack = [], [root]
+        while stack:
+            vertex = stack.pop()
+            subtree.append(vertex)
+            stack.extend(child for child in self._out_edges[vertex] if predecessors[child] == vertex)
+
+        for vertex in subtree:
+            paths_weights[vertex], predecessors[vertex] = float('inf'), None
+
+        frontier = []
+        for vertex in subtree:
+            for parent_vertex, weight in self._in_edges[vertex].items():
+                if paths_weights[parent_vertex] + weight < paths_weights[vertex]:
+                    paths_weights[vertex] = paths_weights[parent_vertex] + weight
+                    predecessors[vertex] = parent_vertex
+            if predecessors[vertex] is not None:
+                frontier.append((paths_weights[vertex], vertex))
+
+        heapq.heapify(frontier)
+        self._settle(predecessors, paths_weights, frontier)
+
+    def _settle(self, predecessors, paths_weights, frontier):
+        """Continues heap engine search from given frontier, updating tree in place."""
+        for _ in _heap_search(lambda vertex: self._out_edges[vertex].items(), predecessors, paths_weights, frontier):
+            pass
 
 
 def friendly_output(graph, start_v, paths_array, paths_weights_array, finish_v):
@@ -57,15 +759,29 @@ def friendly_output(graph, start_v, paths_array, paths_weights_array, finish_v):
         lines = []
         for vertex in range(len(graph)):
             if vertex != start_v:
-                line = 'From {0} to {1} (weight: {3}): {2}'.format(
-                    str(start_v),
-                    str(vertex),
-                    ' --> '.join([str(v) for v in paths_array[vertex]]),
-                    str(paths_weights_array[vertex]),
-                )
+                line = _friendly_line(start_v, vertex, paths_weights_array[vertex], paths_array[vertex])
                 if vertex == finish_v:
                     return line
 
                 lines.append(line)
 
         return '\n'.join(lines)
+
+
+def iter_friendly_output(graph, start_v):
+    """
+    Streaming version of friendly_output() for full traversal.
+    Yields line for each reachable vertex, except starting one, in order of visiting.
+    """
+    for vertex, path_weight, path in iter_dijkstra(graph, start_v):
+        if vertex != start_v:
+            yield _friendly_line(start_v, vertex, path_weight, path)
+
+
+def _friendly_line(start_v, vertex, path_weight, path):
+    return 'From {0} to {1} (weight: {3}): {2}'.format(
+        str(start_v),
+        str(vertex),
+        ' --> '.join([str(v) for v in path]),
+        str(path_weight),
+    )
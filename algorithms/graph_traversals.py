@@ -1,60 +1,582 @@
 """
 Breadth-first search and depth-first search algorithms implementations.
-Both function accepts graph represented as adjacency list.
+Both function accepts graph represented as adjacency list (or CSRGraph).
+
+Direction-optimizing BFS (direction_optimizing=True) works level by level
+on CSRGraph. Small levels are expanded top-down (edges of level vertices are
+checked), but when level has more edges than unvisited part of graph,
+bottom-up step is made instead: each unvisited vertex looks for a parent
+among it's incoming edges and stops on the first one found in the level.
+On large low-diameter graphs this skips most of edges to already visited vertices.
+
+parallel_breadth_first_search() is level-synchronous BFS too, with levels
+expanded in parallel by pool of worker processes.
+
+iter_bfs() and iter_dfs() are lazy versions of both searches: they yield
+vertices in order of visiting, so traversal can be stopped at any moment.
+
+With compact_visited=True visited vertices are tracked in VisitedBitmap
+(one bit per vertex) instead of set (dozens of bytes per vertex).
+
+Bidirectional BFS (bidirectional=True) searches from both ends of the path at
+once, over outgoing edges from starting vertex and over incoming edges from finishing one,
+and explores roughly 2·b^(d/2) vertices instead of b^d.
+Incoming edges are built by reverse_index() in O(V + E) on every call, so for
+repeated queries build them once and pass as reverse_adj_list, or pass CSRGraph,
+which caches it's reversed graph.
+
+multi_source_bfs() and is_reachable() start BFS from several vertices at once,
+and may stop as soon as the nearest of several targets is found.
+
+Whole graph algorithms, each is a single O(V + E) pass without recursion:
+connected_components() (union-find), strongly_connected_components()
+(iterative Tarjan's algorithm) and topological_sort() (Kahn's algorithm).
 """
 
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from algorithms.csr_graph import CSRGraph, attach_shared_memory
 from algorithms.stack_and_queue import Stack, Queue
 
 
-def breadth_first_search(adj_list, start, finish=None):
+OUTPUTS = ('paths', 'parents', 'distances')
+
+
+class VisitedBitmap:
+    """
+    Set of vertices 0..size-1, stored as bits of bytearray.
+    Supported methods: __init__, __contains__, __len__, __iter__, add.
+    """
+    def __init__(self, size):
+        self._bits = bytearray((size + 7) // 8)
+        self._length = 0
+
+    def __contains__(self, vertex):
+        return bool(self._bits[vertex >> 3] & (1 << (vertex & 7)))
+
+    def __len__(self):
+        """Returns number of vertices in the set."""
+        return self._length
+
+    def __iter__(self):
+        """Yields vertices in ascending order."""
+        for byte_index, byte in enumerate(self._bits):
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield (byte_index << 3) | bit
+
+    def add(self, vertex):
+        mask = 1 << (vertex & 7)
+        if not self._bits[vertex >> 3] & mask:
+            self._bits[vertex >> 3] |= mask
+            self._length += 1
+
+
+def _visited_tracker(adj_list, compact_visited):
+    return VisitedBitmap(len(adj_list)) if compact_visited else set()
+
+
+def breadth_first_search(adj_list, start, finish=None, output='paths', direction_optimizing=False,
+                         compact_visited=False, bidirectional=False, reverse_adj_list=None):
     """
     Iterative version implemented via queue.
     If finish is not given:
-    Complete full graph traversal. Returns dictionary with (vertex, shortest path to it from start) items.
+    Complete full graph traversal. Result depends on output argument:
+    'paths' - returns dictionary with (vertex, shortest path to it from start) items;
+    'parents' - returns list of parents, i.e. previous vertices on shortest paths
+                (None for starting and unreachable vertices). Use path_from_parents() to get paths;
+    'distances' - returns list of shortest paths lengths (None for unreachable vertices).
+                  Parents are not stored in this case.
+    Only 'paths' output requires O(V²) memory in the worst case, others are O(V).
     Else:
     Stops as soon as the finishing vertex found.
     Returns shortest path from starting vertex to it.
     If no path to finishing vertex, returns appropriate message.
+
+    If direction_optimizing is True, adjacency list is converted to CSRGraph (if it's not one already).
+    If bidirectional is True (requires finish), searches from both starting and finishing vertices
+    are made until they meet. Backward search uses reverse_adj_list of incoming edges,
+    if it's not given, it's built by reverse_index().
+    Found paths are shortest ones, but in both cases may differ from regular BFS paths,
+    when there are several of them.
+    """
+    if output not in OUTPUTS:
+        raise ValueError('Unknown output: {0}. Expected one of {1}.'.format(output, OUTPUTS))
+
+    if bidirectional:
+        if finish is None:
+            raise ValueError('Bidirectional search requires finishing vertex.')
+        return _bidirectional_bfs(adj_list, start, finish, reverse_adj_list)
+
+    if direction_optimizing:
+        graph = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+        parents, distances = _direction_optimizing_bfs(graph, start, finish)
+    else:
+        track_parents = finish is not None or output != 'distances'
+        parents, distances, _ = _bfs(
+            adj_list, [start], None if finish is None else {finish}, track_parents, output == 'distances', compact_visited
+        )
+
+    return _bfs_result(parents, distances, start, finish, output)
+
+
+def parallel_breadth_first_search(adj_list, start, finish=None, output='paths', max_workers=None):
+    """
+    Level-synchronous BFS, where each level is split into parts, expanded in parallel
+    in process pool. Accepts and returns the same as breadth_first_search().
+    Graph is converted to CSRGraph and placed in shared memory, together with visited map
+    (one byte per vertex), so workers don't need to pickle them.
+    Several workers may claim the same vertex at once, then the first claim is taken.
+    Found paths are shortest ones, but may differ from regular BFS paths, when there are several of them.
+    max_workers is passed to ProcessPoolExecutor.
+    """
+    if output not in OUTPUTS:
+        raise ValueError('Unknown output: {0}. Expected one of {1}.'.format(output, OUTPUTS))
+
+    graph = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+    parents, distances = [None]*len(graph), [None]*len(graph)
+    distances[start] = 0
+    parts_number = 4 * (max_workers or os.cpu_count() or 1)
+
+    descriptor, blocks = graph.to_shared_memory()
+    visited_block = shared_memory.SharedMemory(create=True, size=max(len(graph), 1))
+    visited_block.buf[:len(graph)] = bytes(len(graph))
+    visited_block.buf[start] = 1
+    try:
+        with ProcessPoolExecutor(max_workers, initializer=_attach_parallel_bfs_data,
+                                 initargs=(descriptor, visited_block.name)) as executor:
+            level, level_number = [start], 0
+            while level and (finish is None or distances[finish] is None):
+                part_size = -(-len(level) // parts_number)
+                parts = [level[i:i + part_size] for i in range(0, len(level), part_size)]
+
+                next_level, level_number = [], level_number + 1
+                for claims in executor.map(_expand_level_part, parts):
+                    for vertex, parent in claims:
+                        if distances[vertex] is None:
+                            parents[vertex], distances[vertex] = parent, level_number
+                            next_level.append(vertex)
+                level = next_level
+    finally:
+        for block in blocks + [visited_block]:
+            block.close()
+            block.unlink()
+
+    return _bfs_result(parents, distances, start, finish, output)
+
+
+# Graph, visited map and their shared memory blocks, attached in worker process
+# of parallel_breadth_first_search() pool. All are kept until process exits.
+_parallel_graph, _parallel_visited, _parallel_blocks = None, None, None
+
+
+def _attach_parallel_bfs_data(descriptor, visited_block_name):
+    global _parallel_graph, _parallel_visited, _parallel_blocks
+    _parallel_graph, _parallel_blocks = CSRGraph.from_shared_memory(descriptor)
+    visited_block = attach_shared_memory(visited_block_name)
+    _parallel_blocks.append(visited_block)
+    _parallel_visited = visited_block.buf
+
+
+def _expand_level_part(part):
+    """Marks unvisited neighbors of part vertices as visited, returns list of (neighbor, parent) claims."""
+    claims = []
+    for vertex in part:
+        for neighbor in _parallel_graph[vertex]:
+            if not _parallel_visited[neighbor]:
+                _parallel_visited[neighbor] = 1
+                claims.append((neighbor, vertex))
+    return claims
+
+
+def _bfs_result(parents, distances, start, finish, output):
+    """Builds breadth_first_search() result of required output from parents and distances."""
+    if finish is not None:
+        if finish != start and parents[finish] is None:
+            return 'No path from {0} to {1}'.format(start, finish)
+        return path_from_parents(parents, start, finish)
+    elif output == 'paths':
+        return {vertex: path_from_parents(parents, start, vertex) for vertex in range(len(parents))}
+    elif output == 'parents':
+        return parents
+    else:
+        return distances
+
+
+def path_from_parents(parents, start, vertex):
+    """
+    Returns path from start to vertex as a list, following parents from vertex back to start.
+    If vertex is unreachable, returns [start], same as breadth_first_search() paths.
+    """
+    path = [vertex]
+    while parents[vertex] is not None:
+        vertex = parents[vertex]
+        path.append(vertex)
+
+    if vertex != start:
+        return [start]
+
+    path.reverse()
+    return path
+
+
+def _bfs(adj_list, sources, targets, track_parents=True, track_distances=False, compact_visited=False):
     """
-    paths = {vertex: [start] for vertex in range(len(adj_list))}
-    unvisited, visited = Queue([start]), set()
+    BFS, started from all sources at once.
+    Returns parents list and distances list (each is None, if not tracked) and the first visited target.
+    Stops as soon as any of targets is dequeued, if targets set is given.
+    """
+    parents = [None]*len(adj_list) if track_parents else None
+    distances = [None]*len(adj_list) if track_distances else None
+
+    # Every vertex is added to the queue only once, so it's visited when dequeued.
+    # Vertices, ever added to the queue, are tracked separately: checking membership in the queue itself is O(V).
+    unvisited, enqueued = Queue(), _visited_tracker(adj_list, compact_visited)
+    for source in sources:
+        if source not in enqueued:
+            unvisited.enqueue(source)
+            enqueued.add(source)
+            if track_distances:
+                distances[source] = 0
 
     while unvisited:
         vertex = unvisited.dequeue()
-        if vertex not in visited:
-            # process(vertex) by appropriate function here.
-            visited.add(vertex)
+        # process(vertex) by appropriate function here.
 
-            if vertex == finish:
-                return paths[finish]
+        if targets is not None and vertex in targets:
+            return parents, distances, vertex
 
-            for neighbor in adj_list[vertex]:
-                # if neighbor is not processed yet and not in queue for processing, adds it to the queue,
-                # and updates paths.
-                if neighbor not in visited and neighbor not in unvisited:
-                    unvisited.enqueue(neighbor)
-                    paths[neighbor] = paths[vertex] + [neighbor]
+        for neighbor in adj_list[vertex]:
+            # if neighbor is not processed yet and not in queue for processing, adds it to the queue,
+            # and updates parents and distances.
+            if neighbor not in enqueued:
+                unvisited.enqueue(neighbor)
+                enqueued.add(neighbor)
+                if track_parents:
+                    parents[neighbor] = vertex
+                if track_distances:
+                    distances[neighbor] = distances[vertex] + 1
+
+    return parents, distances, None
+
+
+def reverse_index(adj_list):
+    """
+    Returns adjacency list of incoming edges: list of vertices, which have edges to vertex.
+    Index is built in O(V + E). For CSRGraph it's the reversed graph, cached by the graph itself.
+    """
+    if isinstance(adj_list, CSRGraph):
+        return adj_list.reversed()
 
-    return paths if finish is None else 'No path from {0} to {1}'.format(start, finish)
+    incoming = [[] for _ in range(len(adj_list))]
+    for vertex in range(len(adj_list)):
+        for neighbor in adj_list[vertex]:
+            incoming[neighbor].append(vertex)
 
+    return incoming
 
-def depth_first_search(adj_list, start):
+
+def _bidirectional_bfs(adj_list, start, finish, reverse_adj_list=None):
+    """
+    Forward BFS from start over outgoing edges and backward BFS from finish over incoming edges.
+    On each step the whole level of the side with smaller level is expanded.
+    If any vertex of expanded level is already visited by other side,
+    the shortest of paths through such vertices is returned.
+    Visited vertices of both sides are stored in dicts, so nothing is allocated for unvisited part of graph.
+    """
+    if start == finish:
+        return [start]
+
+    edges = (adj_list, reverse_index(adj_list) if reverse_adj_list is None else reverse_adj_list)
+    # Index 0 is for forward search, index 1 is for backward search.
+    # Backward parent of vertex is actually the next vertex on the way to finish.
+    parents, depths, levels = ({start: None}, {finish: None}), ({start: 0}, {finish: 0}), ([start], [finish])
+
+    while levels[0] and levels[1]:
+        side = 0 if len(levels[0]) <= len(levels[1]) else 1
+        side_parents, side_depths, other_depths = parents[side], depths[side], depths[1 - side]
+
+        next_level, meeting_vertex = [], None
+        for vertex in levels[side]:
+            for neighbor in edges[side][vertex]:
+                if neighbor not in side_parents:
+                    side_parents[neighbor], side_depths[neighbor] = vertex, side_depths[vertex] + 1
+                    next_level.append(neighbor)
+                    # Meeting vertices of the level may be on different depths of other side.
+                    if neighbor in other_depths and \
+                            (meeting_vertex is None or other_depths[neighbor] < other_depths[meeting_vertex]):
+                        meeting_vertex = neighbor
+
+        if meeting_vertex is not None:
+            forward_part, backward_part = [meeting_vertex], []
+            while parents[0][forward_part[-1]] is not None:
+                forward_part.append(parents[0][forward_part[-1]])
+            vertex = parents[1][meeting_vertex]
+            while vertex is not None:
+                backward_part.append(vertex)
+                vertex = parents[1][vertex]
+            return forward_part[::-1] + backward_part
+
+        levels = (next_level, levels[1]) if side == 0 else (levels[0], next_level)
+
+    return 'No path from {0} to {1}'.format(start, finish)
+
+
+def multi_source_bfs(adj_list, sources, targets=None, output='distances'):
+    """
+    BFS, started from all sources at once.
+    If targets are not given:
+    Complete full graph traversal. Returns list of distances to the nearest source
+    (None for unreachable vertices), or list of parents if output is 'parents'
+    (None for sources and unreachable vertices).
+    Else:
+    Stops as soon as the first of targets is found (it's one of the nearest to sources).
+    Returns shortest path to it from the nearest source.
+    If no target is reachable, returns appropriate message.
+    """
+    if output not in ('parents', 'distances'):
+        raise ValueError("Unknown output: {0}. Expected 'parents' or 'distances'.".format(output))
+
+    sources, targets = list(sources), None if targets is None else list(targets)
+    track_parents = targets is not None or output == 'parents'
+    track_distances = targets is None and output == 'distances'
+    parents, distances, found = _bfs(
+        adj_list, sources, None if targets is None else set(targets), track_parents, track_distances
+    )
+
+    if targets is None:
+        return parents if output == 'parents' else distances
+    elif found is None:
+        return 'No path from {0} to {1}'.format(list(sources), list(targets))
+
+    # Parents chain ends at one of the sources.
+    path = [found]
+    while parents[path[-1]] is not None:
+        path.append(parents[path[-1]])
+    path.reverse()
+    return path
+
+
+def is_reachable(adj_list, sources, targets):
+    """Checks if any of targets is reachable from any of sources. Stops as soon as one is found."""
+    return _bfs(adj_list, sources, set(targets), track_parents=False)[2] is not None
+
+
+def _direction_optimizing_bfs(graph, start, finish, alpha=14, beta=24):
+    """
+    Level-synchronous BFS over CSRGraph, returns parents and distances lists.
+    Switches to bottom-up steps, when number of level edges exceeds
+    number of edges of unvisited vertices divided by alpha,
+    and back to top-down, when level has less than V / beta vertices.
+    (Default alpha and beta are the ones suggested by algorithm authors.)
+    Stops after the level, where finishing vertex is found, if it's given.
+    """
+    incoming = graph.reversed()
+    parents, distances = [None]*len(graph), [None]*len(graph)
+    distances[start] = 0
+
+    level, level_number = [start], 0
+    unvisited_edges = len(graph.targets) - graph.degree(start)
+    top_down = True
+
+    while level and (finish is None or distances[finish] is None):
+        level_edges = sum(graph.degree(vertex) for vertex in level)
+        if top_down and level_edges > unvisited_edges / alpha:
+            top_down = False
+        elif not top_down and len(level) < len(graph) / beta:
+            top_down = True
+
+        next_level, level_number = [], level_number + 1
+        if top_down:
+            for vertex in level:
+                for neighbor in graph[vertex]:
+                    if distances[neighbor] is None:
+                        parents[neighbor], distances[neighbor] = vertex, level_number
+                        next_level.append(neighbor)
+        else:
+            for vertex in range(len(graph)):
+                if distances[vertex] is None:
+                    for neighbor in incoming[vertex]:
+                        # Neighbor is in current level.
+                        if distances[neighbor] == level_number - 1:
+                            parents[vertex], distances[vertex] = neighbor, level_number
+                            next_level.append(vertex)
+                            break
+
+        unvisited_edges -= sum(graph.degree(vertex) for vertex in next_level)
+        level = next_level
+
+    return parents, distances
+
+
+def depth_first_search(adj_list, start, compact_visited=False):
     """
     Iterative version implemented via stack.
-    Returns list of visited vertices.
+    Returns set of visited vertices (VisitedBitmap if compact_visited is True).
     """
-    unvisited, visited = Stack([start]), set()
+    visited = _visited_tracker(adj_list, compact_visited)
+    for vertex in iter_dfs(adj_list, start, visited=visited):
+        pass
+
+    return visited
+
+
+def iter_bfs(adj_list, start, details=False, compact_visited=False):
+    """
+    Generator version of breadth_first_search().
+    Yields vertices in order of visiting. If details is True, yields (vertex, depth, parent) tuples,
+    where depth is shortest path length from start and parent is the previous vertex on that path
+    (None for starting vertex).
+    """
+    unvisited, enqueued = Queue([(start, 0, None)]), _visited_tracker(adj_list, compact_visited)
+    enqueued.add(start)
 
     while unvisited:
-        vertex = unvisited.pop()
+        vertex, depth, parent = unvisited.dequeue()
+        yield (vertex, depth, parent) if details else vertex
+
+        for neighbor in adj_list[vertex]:
+            if neighbor not in enqueued:
+                unvisited.enqueue((neighbor, depth + 1, vertex))
+                enqueued.add(neighbor)
+
+
+def iter_dfs(adj_list, start, details=False, compact_visited=False, visited=None):
+    """
+    Generator version of depth_first_search().
+    Yields vertices in order of visiting. If details is True, yields (vertex, depth, parent) tuples,
+    where parent is the vertex, from which this one is visited (None for starting vertex),
+    and depth is the depth of vertex in the search tree.
+    Visited vertices are added to visited argument, if it's given.
+    """
+    if visited is None:
+        visited = _visited_tracker(adj_list, compact_visited)
+    unvisited = Stack([(start, 0, None)])
+
+    while unvisited:
+        vertex, depth, parent = unvisited.pop()
         if vertex not in visited:
-            # process(vertex) by appropriate function here.
             visited.add(vertex)
+            yield (vertex, depth, parent) if details else vertex
 
             for neighbor in adj_list[vertex]:
                 # if neighbor is not processed yet, adds it to the stack.
                 if neighbor not in visited:
-                    unvisited.push(neighbor)
+                    unvisited.push((neighbor, depth + 1, vertex))
 
-    return visited
+
+def connected_components(adj_list):
+    """
+    Edges are treated as undirected.
+    Returns list of components, each is a list of vertices in ascending order.
+    Components are ordered by their lowest vertices.
+    Implemented via union-find with union by size and path halving.
+    """
+    roots, sizes = list(range(len(adj_list))), [1]*len(adj_list)
+
+    def find(vertex):
+        while roots[vertex] != vertex:
+            roots[vertex] = roots[roots[vertex]]
+            vertex = roots[vertex]
+        return vertex
+
+    for vertex in range(len(adj_list)):
+        for neighbor in adj_list[vertex]:
+            vertex_root, neighbor_root = find(vertex), find(neighbor)
+            if vertex_root != neighbor_root:
+                if sizes[vertex_root] < sizes[neighbor_root]:
+                    vertex_root, neighbor_root = neighbor_root, vertex_root
+                roots[neighbor_root] = vertex_root
+                sizes[vertex_root] += sizes[neighbor_root]
+
+    components = {}
+    for vertex in range(len(adj_list)):
+        components.setdefault(find(vertex), []).append(vertex)
+
+    return list(components.values())
+
+
+def strongly_connected_components(adj_list):
+    """
+    Returns list of strongly connected components, each is a list of vertices.
+    Components are in reverse topological order: no edges lead from a component
+    to the ones after it.
+    Iterative Tarjan's algorithm: recursion is replaced by explicit stack
+    of (vertex, iterator over it's unchecked neighbors) items.
+    """
+    indexes, low_links = [None]*len(adj_list), [None]*len(adj_list)
+    on_stack = [False]*len(adj_list)
+    stack, components, counter = [], [], 0
+
+    for root in range(len(adj_list)):
+        if indexes[root] is not None:
+            continue
+
+        indexes[root] = low_links[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        calls = [(root, iter(adj_list[root]))]
+
+        while calls:
+            vertex, neighbors = calls[-1]
+            for neighbor in neighbors:
+                if indexes[neighbor] is None:
+                    # "Recursive call" for neighbor, vertex's iterator keeps it's position.
+                    indexes[neighbor] = low_links[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack[neighbor] = True
+                    calls.append((neighbor, iter(adj_list[neighbor])))
+                    break
+                elif on_stack[neighbor]:
+                    low_links[vertex] = min(low_links[vertex], indexes[neighbor])
+            else:
+                # All neighbors are checked, "returns" from vertex.
+                calls.pop()
+                if calls:
+                    parent = calls[-1][0]
+                    low_links[parent] = min(low_links[parent], low_links[vertex])
+
+                if low_links[vertex] == indexes[vertex]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == vertex:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def topological_sort(adj_list):
+    """
+    Returns list of vertices, where every vertex goes before all vertices it has edges to.
+    Kahn's algorithm: vertices without incoming edges are queued, and edges
+    of dequeued vertex are removed by decreasing counters of incoming edges.
+    If graph has a cycle, ValueError is raised.
+    """
+    in_degrees = [0]*len(adj_list)
+    for vertex in range(len(adj_list)):
+        for neighbor in adj_list[vertex]:
+            in_degrees[neighbor] += 1
+
+    unvisited = Queue([vertex for vertex in range(len(adj_list)) if not in_degrees[vertex]])
+    order = []
+    while unvisited:
+        vertex = unvisited.dequeue()
+        order.append(vertex)
+        for neighbor in adj_list[vertex]:
+            in_degrees[neighbor] -= 1
+            if not in_degrees[neighbor]:
+                unvisited.enqueue(neighbor)
+
+    if len(order) != len(adj_list):
+        raise ValueError('Graph contains a cycle.')
+
+    return order
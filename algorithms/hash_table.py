@@ -1,6 +1,7 @@
 """
 Hash table implementation.
-Collision resolution is separate chaining with singly linked list.
+Collision resolution is separate chaining with singly linked list by default,
+open addressing with linear probing is also available (storage='open_addressing').
 
 Usage example:
 -------
@@ -17,14 +18,20 @@ None
 KeyError: 'Key is not in the hash table.'
 >> h['six'] = 6                             # {'two': 2, 'four': 4, 'six': 6, 'one': 1}
 >> h['one'] = True                          # {'two': 2, 'four': 4, 'six': 6, 'one': True}
->> h.keys()
+>> list(h.keys())
 ['two', 'four', 'six', 'one']
->> h.values()
+>> list(h.values())
 [2, 4, 6, True]
->> h.items()
+>> list(h.items())
 [('two', 2), ('four', 4), ('six', 6), ('one', True)]
 >> len(h)
 4
+# keys(), values() and items() return views, same as dict does.
+# They don't copy anything and reflect later changes of the table.
+>> keys = h.keys()
+>> h['seven'] = 7
+>> 'seven' in keys
+True
 
 Example on collision resolution:
 -------
@@ -39,34 +46,129 @@ Example on collision resolution:
 # Both items are in last array cell,
 # contained in singly linked list.
 # Capacity doubles if load_factor > 0.75.
->> h.add('bar', 3)                    # h._array: [None, None, None, None, «['bar', 3]», «['hello', 1] --> ['world', 2]»]
+>> h.add('bar', 3)                    # h._array: [None, None, None, None, None, None]
+# Items are moved to the new array gradually (see example on resizing), after that:
+#                                       h._array: [None, None, None, None, «['bar', 3]», «['hello', 1] --> ['world', 2]»]
+
+Example on open addressing:
+-------
+>> h = HashTable((), 3, storage='open_addressing')
+# Keys and values are stored in two flat arrays, h._array and h._values.
+>> h.add('hello', 1)                  # h._array: [<empty>, <empty>, 'hello']
+>> h.add('world', 2)                  # h._array: ['world', <empty>, 'hello']
+# Cell 2 is taken, so 'world' goes to the next free cell (wrapping around).
+>> h.pop('hello')                     # h._array: ['world', <empty>, <deleted>]
+1
+# Popped item leaves a tombstone, so 'world' is still found by probing from cell 2.
+# Insertions reuse tombstones, resizing removes them.
+
+Example on resizing:
+-------
+>> h = HashTable((), 4)               # h._array: [None, None, None, None]
+>> h.add('a', 1)
+>> h.add('b', 2)
+>> h.add('c', 3)
+>> h.add('d', 4)                      # load_factor > 0.75, capacity is doubled.
+# New array of capacity 8 is used at once, but items stay in h._old_array
+# and move to h._array gradually: every following insertion or removal
+# moves a few more buckets (at least MIGRATION_STEP, more if the next resizing may come sooner),
+# so moving is finished before the next resizing. Lookups check both arrays meanwhile.
+# Capacity is halved after pop(), if load_factor falls below max_load_factor / 4.
+
+Example on hashing:
+-------
+# Default polynomial hash goes through every symbol of str(key).
+# Native hashing is based on built-in hash(), so it costs O(1) for keys of any length
+# (str and bytes cache their hashes). Index is mixed from it, so strided int keys are spread too.
+>> h = HashTable(hashing='native')
+# With hash_seed, keyed BLAKE2 function is used instead. str, bytes and integral number keys
+# are hashed by their own contents (so it costs O(length) for them), bucket of such key can't be
+# guessed without the seed, and crafted keys can't be forced to collide.
+# Other keys are hashed by their hash() value only, so keys with equal hash() still collide.
+>> h = HashTable(hashing='native', hash_seed=os.urandom(16))
+
+Example on batch operations:
+-------
+>> h = HashTable.from_items(((i, i * i) for i in range(10**6)), hashing='native')
+# Table is sized for all items beforehand, so it's never resized while loading.
+>> h.put_many({1: 'one', 10**6: 'million'})
+>> h.get_many([1, 2, -5], default=0)
+['one', 4, 0]
+# Whole batch of keys is hashed at once. With native hashing (without hash_seed)
+# int keys are hashed by vectorized NumPy code, if numpy is installed.
 """
+import math
+import numbers
+import sys
+from collections.abc import ItemsView, KeysView, ValuesView
+from hashlib import blake2b
 from algorithms.linked_lists import SinglyLinkedList
 
 
+STORAGES = ('chaining', 'open_addressing')
+HASHINGS = ('polynomial', 'native')
+
+# Minimal number of old buckets moved to the new array by every insertion or removal while resizing.
+MIGRATION_STEP = 4
+# Tables are never shrunk below this capacity.
+MIN_CAPACITY = 8
+
+_MASK64 = (1 << 64) - 1
+# hash() of ints with absolute value lower than this is the int itself.
+_HASH_MODULUS = sys.hash_info.modulus
+
+# Markers of open addressing cells. None can't be used, as it's a valid key.
+_EMPTY = object()
+_DELETED = object()
+# Default value of get(), which tells that key is missing.
+_MISSING = object()
+
+
 class HashTable:
     """
-    Supported methods: __init__, __iter__, __contains__, __len__,
+    Supported methods: __new__, __init__, __iter__, __contains__, __len__,
     __getitem__, __setitem__, __repr__, , _get_capacity,
-    _get_load_factor, _increase_capacity, keys, values, items, get, add, pop.
+    _get_load_factor, _increase_capacity, _decrease_capacity, _resize, _reserve, _iter_items,
+    from_items, keys, values, items, get, get_many, add, put_many, pop.
     All methods behave the same as python dict methods.
+    storage argument selects collision resolution: 'chaining' (default)
+    or 'open_addressing' (instance of OpenAddressingHashTable is created then).
+    hashing argument selects hash function: 'polynomial' (default) or 'native',
+    hash_seed (int or up to 64 bytes) makes native hashing keyed.
     """
-    def __init__(self, iterable=(), capacity=None, max_load_factor=0.75):
+    def __new__(cls, iterable=(), capacity=None, max_load_factor=0.75, storage='chaining',
+                hashing='polynomial', hash_seed=None):
+        if storage not in STORAGES:
+            raise ValueError('Unknown storage: {0}. Expected one of: {1}.'.format(storage, ', '.join(STORAGES)))
+
+        if cls is HashTable and storage == 'open_addressing':
+            cls = OpenAddressingHashTable
+
+        return super().__new__(cls)
+
+    def __init__(self, iterable=(), capacity=None, max_load_factor=0.75, storage='chaining',
+                 hashing='polynomial', hash_seed=None):
+        self._set_hashing(hashing, hash_seed)
         self._length = 0
         self._max_load_factor = max_load_factor
         self._array = [None]*self._get_capacity(capacity, iterable)
+        # Array, which items are being moved to self._array, and index of it's next bucket to move.
+        self._old_array = None
+        self._migrated = 0
+        self._migration_step = MIGRATION_STEP
 
         self._build_hash_table(iterable)
 
     def __iter__(self):
         """Yields key on each iteration."""
-        for cell in self._array:
-            if cell is not None:
-                for item in cell:
-                    yield item[0]
+        for array in (self._array, self._old_array or ()):
+            for cell in array:
+                if cell is not None:
+                    for item in cell:
+                        yield item[0]
 
     def __contains__(self, key):
-        return key in self.keys()
+        return self.get(key, _MISSING) is not _MISSING
 
     def __len__(self):
         """Returns number of (key, value) pairs in hash table."""
@@ -77,39 +179,22 @@ class HashTable:
         Returns value by required key.
         if key is not in the hash table, raises KeyError.
         """
-        if key not in self:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
             raise KeyError('Key is not in the hash table.')
-        else:
-            return self.get(key)
+
+        return value
 
     def __setitem__(self, key, value):
         """
         If key is already in the table, overwrites it's value by provided data.
         Else adds (key, value) pair to hash table.
         """
-        index = self._hash(key)
-
-        if self._array[index]:
-            for item in self._array[index]:
-                if item[0] == key:
-                    item[1] = value
-                    return
-
-            self._array[index].add([key, value])
-
-        else:
-            self._array[index] = SinglyLinkedList(([key, value],))
-
-        self._length += 1
-
-        if self._get_load_factor() > self._max_load_factor:
-            self._increase_capacity()
+        self._put(key, self._hash_value(key), value, overwrite=True)
 
     def __repr__(self):
         items_repr = []
-        for key in self:
-            value = self.get(key)
-
+        for key, value in self._iter_items():
             item_repr = "{0}: {1}".format(
                 "'{}'".format(key) if isinstance(key, str) else key,
                 "'{}'".format(value) if isinstance(value, str) else value
@@ -139,14 +224,32 @@ class HashTable:
 
                 self.add(item[0], item[1])
 
+    def _set_hashing(self, hashing, hash_seed):
+        if hashing not in HASHINGS:
+            raise ValueError('Unknown hashing: {0}. Expected one of: {1}.'.format(hashing, ', '.join(HASHINGS)))
+        if hash_seed is not None and hashing != 'native':
+            raise ValueError('hash_seed is only supported by native hashing.')
+
+        self._hashing = hashing
+        self._hash_seed = hash_seed
+        # BLAKE2 key is bytes (up to 64), so int seeds must fit in 128 bits.
+        self._hash_key = hash_seed.to_bytes(16, 'little', signed=True) if isinstance(hash_seed, int) else hash_seed
+
     def _hash(self, key):
         """
-        Accepts hashable key and transforms it into an integer hash value.
+        Accepts hashable key and transforms it into an index of self._array.
         If key is not hashable, TypeError is raised.
         """
+        return self._hash_value(key) % len(self._array)
+
+    def _hash_value(self, key):
+        """Returns integer hash value of key, not limited by table capacity."""
         if not key.__hash__:
             raise TypeError('Unhashable key type')
 
+        if self._hashing == 'native':
+            return _native_hash(key, self._hash_key)
+
         # Has separate constant value for str type, so
         # 1 and '1' keys are hashed differently.
         const = 53 if isinstance(key, str) else 47
@@ -156,62 +259,145 @@ class HashTable:
             # Pow variates from 0 to 5, so hash is not gonna be huge if long argument is passed.
             hash_value += abs(const - ord(symbol)) * (const**(max_pow - (i % max_pow)))
 
-        # Makes hash value lower than table capacity.
-        return hash_value % len(self._array)
+        return hash_value
 
-    def _get_load_factor(self):
-        return len(self) / len(self._array)
-
-    def _increase_capacity(self):
+    def _hash_values(self, keys):
         """
-        Doubles capacity of self._array by
-        creating temp hash table, copying all (key, value) pairs to it and
-        replacing original table array with an increased temp array.
+        Returns list of hash values of keys list.
+        With native hashing int keys are hashed at once by NumPy, if it's installed.
         """
-        temp_hash_table = HashTable((), len(self._array) * 2)
-        for key in self:
-            temp_hash_table.add(key, self[key])
+        if self._hashing == 'native' and self._hash_key is None and all(type(key) is int for key in keys):
+            hash_values = _native_hash_ints(keys)
+            if hash_values is not None:
+                return hash_values
 
-        self._array = temp_hash_table._array
+        return [self._hash_value(key) for key in keys]
 
-    def keys(self):
-        """Returns list of keys."""
-        return [key for key in self]
+    def _get_load_factor(self):
+        return len(self) / len(self._array)
 
-    def values(self):
-        """Returns list of values."""
-        return [self[key] for key in self]
+    def _get_fill_factor(self):
+        # Share of the array, which is taken. Load factor for separate chaining.
+        return self._get_load_factor()
 
-    def items(self):
-        """Returns list of (key, value) items."""
-        return [(key, self[key]) for key in self]
+    def _increase_capacity(self):
+        """Doubles capacity of self._array."""
+        self._resize(len(self._array) * 2)
 
-    def get(self, key, default=None):
+    def _decrease_capacity(self):
+        """Halves capacity of self._array, if load_factor has fallen below max_load_factor / 4."""
+        if len(self._array) > MIN_CAPACITY and self._get_load_factor() < self._max_load_factor / 4:
+            self._resize(max(len(self._array) // 2, MIN_CAPACITY))
+
+    def _resize(self, capacity):
         """
-        Returns value by a given key.
-        If key is not in hash table, returns default (or None).
+        Replaces self._array with an empty array of required capacity.
+        Items are not copied at once: previous array is kept as self._old_array
+        and every following insertion or removal moves a few of it's buckets,
+        so the cost of resizing is spread over many operations.
+        Number of buckets per operation is chosen so that all of them are moved
+        before the next resizing can be required. If previous resizing is still
+        in progress anyway (after _reserve()), it's finished first.
         """
-        index = self._hash(key)
+        if self._old_array is not None:
+            self._migrate(len(self._old_array))
 
-        if self._array[index]:
-            for item in self._array[index]:
-                if item[0] == key:
-                    return item[1]
+        self._allocate(capacity)
+        self._migrated = 0
 
-        return default
+        # Fewest writes, after which the table may need resizing again: insertions until
+        # load_factor exceeds max_load_factor, or removals until it falls below max_load_factor / 4.
+        writes_left = self._max_load_factor * capacity - len(self)
+        if capacity > MIN_CAPACITY:
+            writes_left = min(writes_left, len(self) - self._max_load_factor / 4 * capacity)
+        self._migration_step = max(MIGRATION_STEP, math.ceil(len(self._old_array) / max(writes_left, 1)))
 
-    def add(self, key, value):
+    def _reserve(self, count):
         """
-        Adds key and value to the hash table.
-        If key is already in table, KeyError is raised.
+        Makes room for count more items at once, so they can be added without resizing.
+        Resizing in progress is finished too.
+        """
+        if self._get_fill_factor() + count / len(self._array) > self._max_load_factor:
+            self._resize(int((len(self) + count) / self._max_load_factor) + 1)
+
+        if self._old_array is not None:
+            self._migrate(len(self._old_array))
+
+    def _allocate(self, capacity):
+        self._old_array = self._array
+        self._array = [None]*capacity
+
+    def _migrate(self, count):
+        """Moves next count buckets of self._old_array to self._array."""
+        stop = min(self._migrated + count, len(self._old_array))
+        for old_index in range(self._migrated, stop):
+            self._migrate_bucket(old_index)
+
+        self._migrated = stop
+        if self._migrated == len(self._old_array):
+            self._release_old_array()
+
+    def _release_old_array(self):
+        self._old_array = None
+
+    def _migrate_bucket(self, old_index):
+        bucket = self._old_array[old_index]
+        if bucket is None:
+            return
+
+        # Items themselves are reused, only buckets are new.
+        self._old_array[old_index] = None
+        for item in bucket:
+            index = self._hash(item[0])
+            if self._array[index] is None:
+                self._array[index] = SinglyLinkedList((item,))
+            else:
+                self._array[index].add(item)
+
+    def _migrate_key(self, key, hash_value):
+        self._migrate_bucket(hash_value % len(self._old_array))
+
+    def _prepare_write(self, key, hash_value):
+        """
+        Continues resizing, if it's in progress, and moves key to self._array
+        (if it's still in self._old_array), so writes deal with self._array only.
         """
-        index = self._hash(key)
+        if self._old_array is not None:
+            self._migrate(self._migration_step)
+        if self._old_array is not None:
+            self._migrate_key(key, hash_value)
+
+    def _find_item(self, key, hash_value):
+        """Returns [key, value] item of the table, or None if key is not in the table."""
+        buckets = [self._array[hash_value % len(self._array)]]
+        if self._old_array is not None:
+            buckets.append(self._old_array[hash_value % len(self._old_array)])
+
+        for bucket in buckets:
+            if bucket is not None:
+                for item in bucket:
+                    if item[0] == key:
+                        return item
+
+        return None
+
+    def _get(self, key, hash_value, default):
+        item = self._find_item(key, hash_value)
+        return default if item is None else item[1]
+
+    def _put(self, key, hash_value, value, overwrite):
+        self._prepare_write(key, hash_value)
+        index = hash_value % len(self._array)
 
         # If True - Collision.
         if self._array[index]:
             for item in self._array[index]:
                 if item[0] == key:
-                    raise KeyError('Item with this key already exists')
+                    if not overwrite:
+                        raise KeyError('Item with this key already exists')
+
+                    item[1] = value
+                    return
 
             self._array[index].add([key, value])
         else:
@@ -222,12 +408,85 @@ class HashTable:
         if self._get_load_factor() > self._max_load_factor:
             self._increase_capacity()
 
+    def _iter_items(self):
+        """Yields (key, value) pairs, reading them right from the arrays."""
+        for array in (self._array, self._old_array or ()):
+            for cell in array:
+                if cell is not None:
+                    for item in cell:
+                        yield item[0], item[1]
+
+    @classmethod
+    def from_items(cls, items, max_load_factor=0.75, storage='chaining', hashing='polynomial', hash_seed=None):
+        """
+        Builds hash table from items (dict or iterable of (key, value) pairs) in bulk.
+        Capacity is chosen from number of items, so the table is never resized while loading.
+        As in dict, value of repeated key is overwritten by the last one.
+        """
+        items = list(items.items()) if isinstance(items, dict) else list(items)
+        table = cls((), int(len(items) / max_load_factor) + 1, max_load_factor, storage, hashing, hash_seed)
+        table.put_many(items)
+
+        return table
+
+    def keys(self):
+        """Returns live view of keys."""
+        return HashTableKeysView(self)
+
+    def values(self):
+        """Returns live view of values."""
+        return HashTableValuesView(self)
+
+    def items(self):
+        """Returns live view of (key, value) items."""
+        return HashTableItemsView(self)
+
+    def get(self, key, default=None):
+        """
+        Returns value by a given key.
+        If key is not in hash table, returns default (or None).
+        """
+        return self._get(key, self._hash_value(key), default)
+
+    def get_many(self, keys, default=None):
+        """
+        Returns list of values by given keys (default for keys, which are not in hash table).
+        Whole batch of keys is hashed at once.
+        """
+        keys = list(keys)
+        return [self._get(key, hash_value, default) for key, hash_value in zip(keys, self._hash_values(keys))]
+
+    def add(self, key, value):
+        """
+        Adds key and value to the hash table.
+        If key is already in table, KeyError is raised.
+        """
+        self._put(key, self._hash_value(key), value, overwrite=False)
+
+    def put_many(self, items):
+        """
+        Adds items (dict or iterable of (key, value) pairs) to the hash table,
+        overwriting values of existing keys. Whole batch of keys is hashed at once,
+        and the table is resized (if needed) only once, before insertion.
+        """
+        items = list(items.items()) if isinstance(items, dict) else list(items)
+        if any(len(item) != 2 for item in items):
+            raise TypeError('Expected sequence of containers with 2 elements inside.')
+
+        keys = [item[0] for item in items]
+        hash_values = self._hash_values(keys)
+        self._reserve(len(items))
+        for (key, value), hash_value in zip(items, hash_values):
+            self._put(key, hash_value, value, overwrite=True)
+
     def pop(self, key):
         """
         Returns value by a given key, and removes (key, value) item from hash table.
         Raises KeyError if key is not in the table.
         """
-        index = self._hash(key)
+        hash_value = self._hash_value(key)
+        self._prepare_write(key, hash_value)
+        index = hash_value % len(self._array)
 
         if self._array[index]:
             for i, item in enumerate(self._array[index]):
@@ -239,7 +498,280 @@ class HashTable:
                         self._array[index] = None
 
                     self._length -= 1
+                    self._decrease_capacity()
 
                     return value
 
         raise KeyError('Key is not in the hash table.')
+
+
+class OpenAddressingHashTable(HashTable):
+    """
+    Hash table with open addressing collision resolution (linear probing).
+    Keys and values are kept in two flat arrays of equal length (self._array and self._values),
+    so there are no per-item linked lists and probing walks through neighbouring cells.
+    Popped items leave tombstones, which are reused by insertions and removed by resizing.
+    Usually created as HashTable(..., storage='open_addressing').
+    Overridden methods: __init__, __iter__, _iter_items, _get_fill_factor, _increase_capacity, _allocate,
+    _release_old_array, _migrate_bucket, _migrate_key, _get, _put, pop.
+    Self methods: _probe.
+    """
+    def __init__(self, iterable=(), capacity=None, max_load_factor=0.75, storage='open_addressing',
+                 hashing='polynomial', hash_seed=None):
+        # Table must always have an empty cell, otherwise probing for a missing key never ends.
+        if not 0 < max_load_factor < 1:
+            raise ValueError('Open addressing requires max_load_factor between 0 and 1, got {0}.'.format(
+                max_load_factor
+            ))
+
+        self._set_hashing(hashing, hash_seed)
+        capacity = self._get_capacity(capacity, iterable)
+        self._length = 0
+        self._deleted = 0
+        self._max_load_factor = max_load_factor
+        self._array = [_EMPTY]*capacity
+        self._values = [None]*capacity
+        self._old_array = None
+        self._old_values = None
+        self._migrated = 0
+        self._migration_step = MIGRATION_STEP
+
+        self._build_hash_table(iterable)
+
+    def __iter__(self):
+        """Yields key on each iteration."""
+        for keys in (self._array, self._old_array or ()):
+            for key in keys:
+                if key is not _EMPTY and key is not _DELETED:
+                    yield key
+
+    def _iter_items(self):
+        """Yields (key, value) pairs, reading them right from the arrays."""
+        for keys, values in ((self._array, self._values), (self._old_array or (), self._old_values or ())):
+            for key, value in zip(keys, values):
+                if key is not _EMPTY and key is not _DELETED:
+                    yield key, value
+
+    def _probe(self, key, hash_value, keys):
+        """
+        Looks for key in keys array (self._array or self._old_array).
+        Returns (index, found) pair. If key is in the array, index is it's cell.
+        Otherwise index is the cell where key should be inserted:
+        the first tombstone of probing sequence or the empty cell that ends it.
+        Old array may be full when resizing starts, so probing stops after visiting
+        every cell, index is None then.
+        """
+        index = hash_value % len(keys)
+        free_index = None
+        for _ in range(len(keys)):
+            cell_key = keys[index]
+            if cell_key is _EMPTY:
+                return (index if free_index is None else free_index), False
+            elif cell_key is _DELETED:
+                if free_index is None:
+                    free_index = index
+            elif cell_key == key:
+                return index, True
+
+            index = (index + 1) % len(keys)
+
+        return free_index, False
+
+    def _get(self, key, hash_value, default):
+        index, found = self._probe(key, hash_value, self._array)
+        if found:
+            return self._values[index]
+
+        if self._old_array is not None:
+            index, found = self._probe(key, hash_value, self._old_array)
+            if found:
+                return self._old_values[index]
+
+        return default
+
+    def _put(self, key, hash_value, value, overwrite):
+        self._prepare_write(key, hash_value)
+        index, found = self._probe(key, hash_value, self._array)
+        if found:
+            if not overwrite:
+                raise KeyError('Item with this key already exists')
+
+            self._values[index] = value
+            return
+
+        if self._array[index] is _DELETED:
+            self._deleted -= 1
+
+        self._array[index] = key
+        self._values[index] = value
+        self._length += 1
+
+        if self._get_fill_factor() > self._max_load_factor:
+            self._increase_capacity()
+
+    def _get_fill_factor(self):
+        # Tombstones make probing sequences longer just as items do.
+        # Items of self._old_array are counted too, as they are going to be moved.
+        return (self._length + self._deleted) / len(self._array)
+
+    def _increase_capacity(self):
+        """
+        Doubles capacity of the table.
+        If the table is filled mostly with tombstones, it's enough to clear them,
+        which resizing does anyway. Capacity is chosen then for load_factor of
+        max_load_factor / 2, far from both growing and shrinking.
+        """
+        if self._get_load_factor() > self._max_load_factor * 3 / 4:
+            capacity = len(self._array) * 2
+        else:
+            capacity = max(int(len(self) / (self._max_load_factor / 2)) + 1, MIN_CAPACITY)
+
+        self._resize(capacity)
+
+    def _allocate(self, capacity):
+        self._old_array, self._old_values = self._array, self._values
+        self._array = [_EMPTY]*capacity
+        self._values = [None]*capacity
+        self._deleted = 0
+
+    def _release_old_array(self):
+        self._old_array = None
+        self._old_values = None
+
+    def _migrate_bucket(self, old_index):
+        key = self._old_array[old_index]
+        if key is _EMPTY or key is _DELETED:
+            return
+
+        index = self._probe(key, self._hash_value(key), self._array)[0]
+        if self._array[index] is _DELETED:
+            self._deleted -= 1
+
+        self._array[index] = key
+        self._values[index] = self._old_values[old_index]
+        # Moved item leaves a tombstone, so probing sequences of old array stay intact.
+        self._old_array[old_index] = _DELETED
+        self._old_values[old_index] = None
+
+    def _migrate_key(self, key, hash_value):
+        old_index, found = self._probe(key, hash_value, self._old_array)
+        if found:
+            self._migrate_bucket(old_index)
+
+    def pop(self, key):
+        """
+        Returns value by a given key, and removes (key, value) item from hash table.
+        Raises KeyError if key is not in the table.
+        """
+        hash_value = self._hash_value(key)
+        self._prepare_write(key, hash_value)
+        index, found = self._probe(key, hash_value, self._array)
+        if not found:
+            raise KeyError('Key is not in the hash table.')
+
+        value = self._values[index]
+        self._array[index] = _DELETED
+        self._values[index] = None
+        self._length -= 1
+        self._deleted += 1
+        self._decrease_capacity()
+
+        return value
+
+
+class HashTableKeysView(KeysView):
+    """Live view of hash table keys, returned by HashTable.keys()."""
+
+
+class HashTableValuesView(ValuesView):
+    """Live view of hash table values, returned by HashTable.values()."""
+    def __iter__(self):
+        # Values are read from the arrays, not looked up by every key.
+        for key, value in self._mapping._iter_items():
+            yield value
+
+    def __contains__(self, value):
+        for _, item_value in self._mapping._iter_items():
+            if item_value is value or item_value == value:
+                return True
+
+        return False
+
+
+class HashTableItemsView(ItemsView):
+    """Live view of hash table (key, value) items, returned by HashTable.items()."""
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+def _native_hash_ints(keys):
+    """
+    Vectorized _native_hash() of list of int keys, without hash_key.
+    Returns None if numpy is not installed, or if some keys are too big,
+    as their hash() is not the key itself.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+
+    try:
+        hash_values = np.array(keys, dtype=np.int64)
+    except OverflowError:
+        return None
+    if len(keys) and (hash_values.min() <= -_HASH_MODULUS or hash_values.max() >= _HASH_MODULUS):
+        return None
+
+    # hash(-1) is -2, as -1 is reserved for errors in CPython.
+    hash_values[hash_values == -1] = -2
+    # Negative values wrap around, same as hash(key) & _MASK64. Multiplications wrap around too.
+    hash_values = hash_values.astype(np.uint64)
+    hash_values = (hash_values ^ (hash_values >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+    hash_values = (hash_values ^ (hash_values >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+    return (hash_values ^ (hash_values >> np.uint64(31))).tolist()
+
+
+def _native_hash(key, hash_key=None):
+    """
+    Returns 64 bit hash value of key, based on built-in hash().
+    hash() of int is the int itself, so it's mixed by splitmix64 finalizer,
+    otherwise keys with a common stride would share a few buckets.
+    If hash_key (bytes) is given, keyed BLAKE2 is used instead. It hashes contents of
+    the key, if it's available (see _key_bytes()), as mixing of hash() can't separate
+    keys with equal hash() values, and such keys are easy to craft (5 and 5 + 2**61 - 1).
+    """
+    hash_value = hash(key) & _MASK64
+    if hash_key is not None:
+        key_bytes = _key_bytes(key)
+        if key_bytes is None:
+            key_bytes = b'h' + hash_value.to_bytes(8, 'little')
+        return int.from_bytes(blake2b(key_bytes, digest_size=8, key=hash_key).digest(), 'little')
+
+    hash_value = ((hash_value ^ (hash_value >> 30)) * 0xbf58476d1ce4e5b9) & _MASK64
+    hash_value = ((hash_value ^ (hash_value >> 27)) * 0x94d049bb133111eb) & _MASK64
+    return hash_value ^ (hash_value >> 31)
+
+
+def _key_bytes(key):
+    """
+    Returns bytes, identifying str, bytes or integral number key, or None for other keys.
+    Equal keys give equal bytes: 1, 1.0 and True are all the same key.
+    """
+    if isinstance(key, str):
+        return b's' + key.encode('utf-8', 'surrogatepass')
+    if isinstance(key, (bytes, memoryview)):
+        return b'b' + bytes(key)
+    if isinstance(key, numbers.Number):
+        if isinstance(key, numbers.Complex) and not isinstance(key, numbers.Real):
+            if key.imag:
+                return None
+            key = key.real
+
+        try:
+            integer = int(key)
+        except (TypeError, ValueError, OverflowError):
+            return None
+        if integer == key:
+            return b'i' + integer.to_bytes(integer.bit_length() // 8 + 1, 'little', signed=True)
+
+    return None
@@ -0,0 +1,158 @@
+"""
+Tests for CSRGraph class.
+"""
+
+import os
+import subprocess
+import sys
+import pytest
+from algorithms.csr_graph import CSRGraph, read_csr_graph, write_csr_graph
+from algorithms.dijkstra_algorithm import dijkstra
+from algorithms.graph_traversals import breadth_first_search
+
+
+# Constants.
+
+ADJ_MATRIX = [
+    [0, 4, 1],
+    [0, 0, 2],
+    [0, 0, 0]
+]
+ADJ_LIST = [[(1, 4), (2, 1)], [(2, 2)], []]
+OFFSETS, TARGETS, WEIGHTS = [0, 2, 3, 3], [1, 2, 2], [4, 1, 2]
+
+
+# Tests.
+
+def test_len():
+    assert len(CSRGraph(OFFSETS, TARGETS, WEIGHTS)) == 3
+
+
+@pytest.mark.parametrize('vertex', [0, 1, 2])
+def test_edges(vertex):
+    assert list(CSRGraph(OFFSETS, TARGETS, WEIGHTS).edges(vertex)) == ADJ_LIST[vertex]
+
+
+@pytest.mark.parametrize('graph', [
+    CSRGraph.from_adj_list(ADJ_LIST),
+    CSRGraph.from_adj_matrix(ADJ_MATRIX),
+])
+def test_build_from_other_formats(graph):
+    assert (list(graph.offsets), list(graph.targets), list(graph.weights)) == (OFFSETS, TARGETS, WEIGHTS)
+
+
+def test_integer_weights_stay_integers():
+    assert all(isinstance(weight, int) for weight in CSRGraph.from_adj_list(ADJ_LIST).weights)
+
+
+def test_float_weights():
+    assert list(CSRGraph.from_adj_list([[(1, 0.5)], []]).weights) == [0.5]
+
+
+@pytest.mark.parametrize('offsets, targets, weights', [
+    ([], [], []),
+    ([1, 2], [1], [1]),
+    ([0, 2], [1], [1]),
+    ([0, 1], [1], []),
+])
+def test_wrong_arrays_raise_error(offsets, targets, weights):
+    with pytest.raises(ValueError):
+        CSRGraph(offsets, targets, weights)
+
+
+def test_reversed():
+    graph = CSRGraph(OFFSETS, TARGETS, WEIGHTS).reversed()
+    assert [list(graph.edges(vertex)) for vertex in range(len(graph))] == [[], [(0, 4)], [(0, 1), (1, 2)]]
+
+
+def test_shared_memory_round_trip():
+    descriptor, blocks = CSRGraph.from_adj_list([[(1, 0.5)], [], [(0, 2.5)]]).to_shared_memory()
+    graph, attached_blocks = CSRGraph.from_shared_memory(descriptor)
+    edges = [list(graph.edges(vertex)) for vertex in range(len(graph))]
+
+    del graph
+    for block in attached_blocks:
+        block.close()
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+    assert edges == [[(1, 0.5)], [], [(0, 2.5)]]
+
+
+# Runs in a separate interpreter, as resource tracker reports errors and leaks only when it exits.
+POOL_SCRIPT = """
+import multiprocessing
+multiprocessing.set_start_method({0!r})
+from algorithms.dijkstra_algorithm import all_pairs_shortest_paths, batch_dijkstra
+from algorithms.graph_traversals import parallel_breadth_first_search
+graph = [[(1, 1)], [(2, 1)], [(0, 1)]]
+batch_dijkstra(graph, [(0, 2), (1, None), (2, None)], max_workers=2)
+all_pairs_shortest_paths(graph, max_workers=2)
+parallel_breadth_first_search([[1], [2], [0]], 0, max_workers=2)
+"""
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason='Requires POSIX shared memory in /dev/shm.')
+@pytest.mark.parametrize('start_method', ['fork', 'spawn'])
+def test_process_pools_clean_up_shared_memory(start_method):
+    blocks_before = set(os.listdir('/dev/shm'))
+    result = subprocess.run(
+        [sys.executable, '-c', POOL_SCRIPT.format(start_method)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    # Resource tracker prints tracebacks and leak warnings to stderr.
+    assert result.stderr == ''
+    assert set(os.listdir('/dev/shm')) - blocks_before == set()
+
+
+def test_unweighted_graph():
+    graph = CSRGraph.from_adj_list([[1, 2], [2], []])
+    assert (graph.weights, list(graph.edges(0)), list(graph[0]), graph.degree(1)) == (None, [(1, 1), (2, 1)], [1, 2], 1)
+
+
+def test_unweighted_graph_reversed():
+    graph = CSRGraph.from_adj_list([[1, 2], [2], []]).reversed()
+    assert [list(graph[vertex]) for vertex in range(len(graph))] == [[], [0], [0, 1]]
+
+
+def test_reversed_is_cached():
+    graph = CSRGraph(OFFSETS, TARGETS, WEIGHTS)
+    assert graph.reversed() is graph.reversed()
+
+
+@pytest.mark.parametrize('adj_list', [
+    ADJ_LIST,
+    [[(1, 0.5)], [], [(0, 2.5), (1, 1.5)]],
+    [[1, 2], [2], [0], []],
+    [[], []],
+])
+def test_file_round_trip(tmp_path, adj_list):
+    write_csr_graph(tmp_path / 'graph.csr', adj_list)
+    graph, expected = read_csr_graph(tmp_path / 'graph.csr'), CSRGraph.from_adj_list(adj_list)
+    assert isinstance(graph.targets, memoryview)
+    assert [list(graph.edges(vertex)) for vertex in range(len(graph))] == \
+           [list(expected.edges(vertex)) for vertex in range(len(expected))]
+
+
+def test_algorithms_accept_graph_from_file(tmp_path):
+    write_csr_graph(tmp_path / 'graph.csr', CSRGraph.from_adj_matrix(ADJ_MATRIX))
+    graph = read_csr_graph(tmp_path / 'graph.csr')
+    assert dijkstra(graph, 0, engine='heap') == dijkstra(ADJ_MATRIX, 0)
+    assert {vertex: list(path) for vertex, path in breadth_first_search(graph, 0).items()} == \
+           {0: [0], 1: [0, 1], 2: [0, 2]}
+
+
+@pytest.mark.parametrize('content', [
+    b'',
+    b'CSRG',
+    b'GRAPH' + bytes(40),
+    # Correct header of graph with 1 vertex and no edges, but offsets array is missing.
+    b'CSRG\x01' + (b'<' if sys.byteorder == 'little' else b'>') + b'-\x00' + (1).to_bytes(8, sys.byteorder) + bytes(8),
+])
+def test_read_wrong_file_raise_error(tmp_path, content):
+    (tmp_path / 'graph.csr').write_bytes(content)
+    with pytest.raises(ValueError):
+        read_csr_graph(tmp_path / 'graph.csr')
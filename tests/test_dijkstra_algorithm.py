@@ -1,10 +1,18 @@
 """
 Tests for Dijkstra algorithm.
-Graphs are represented as adjacency matrices.
+Graphs are represented as adjacency matrices,
+every test also runs them converted to adjacency lists and CSR graphs.
 """
 
+import random
 import pytest
-from algorithms.dijkstra_algorithm import dijkstra
+from algorithms import dijkstra_algorithm
+from algorithms.csr_graph import CSRGraph
+from algorithms.dijkstra_algorithm import (
+    dijkstra, iter_dijkstra, a_star, batch_dijkstra, all_pairs_shortest_paths,
+    friendly_output, iter_friendly_output, euclidean_heuristic, manhattan_heuristic, zero_heuristic,
+    ENGINES, PredecessorPaths, ShortestPathIndex
+)
 
 
 # Connected graphs.
@@ -37,11 +45,73 @@ GRAPH5 = [
     [0, 0, 0]
 ]
 
+# Random sparse graph.
+
+random.seed(0)
+GRAPH6 = [[random.randint(1, 9) if random.random() < 0.1 else 0 for _ in range(60)] for _ in range(60)]
+
+# 5x5 grid graph with coordinates, edge weights are not less than distances between vertices.
+
+GRID_SIZE = 5
+GRID_COORDINATES = [(vertex % GRID_SIZE, vertex // GRID_SIZE) for vertex in range(GRID_SIZE**2)]
+GRID = [
+    [
+        (neighbor, 1 + (vertex * neighbor) % 3)
+        for neighbor in range(GRID_SIZE**2)
+        if sum(abs(a - b) for a, b in zip(GRID_COORDINATES[vertex], GRID_COORDINATES[neighbor])) == 1
+    ]
+    for vertex in range(GRID_SIZE**2)
+]
+
+# Graphs with negative edges.
+
+GRAPH7 = [
+    [0, 4, 2, 0],
+    [0, 0, 0, 2],
+    [0, -3, 0, 6],
+    [0, 0, 0, 0]
+]
+# Negative cycle 1 -> 2 -> 1.
+GRAPH8 = [
+    [0, 1, 0],
+    [0, 0, -2],
+    [0, 1, 0]
+]
+
 # Infinity.
 
 INF = float('inf')
 
 
+# Local fixtures.
+
+@pytest.fixture(params=ENGINES)
+def engine(request):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    return request.param
+
+
+def to_adj_list(adj_matrix):
+    return [[(neighbor, weight) for neighbor, weight in enumerate(row) if weight] for row in adj_matrix]
+
+
+@pytest.fixture(params=['floyd-warshall', 'johnson'])
+def all_pairs_method(request):
+    if request.param == 'floyd-warshall':
+        pytest.importorskip('numpy')
+    return request.param
+
+
+@pytest.fixture(params=[
+    lambda adj_matrix: adj_matrix,
+    to_adj_list,
+    CSRGraph.from_adj_matrix,
+], ids=['matrix', 'list', 'csr'])
+def graph_format(request):
+    return request.param
+
+
 @pytest.mark.parametrize('adj_matrix, start, paths, paths_weights', [
     (GRAPH1, 0, [(0, ), (0, 1)], [0, 4]),
     (GRAPH1, 1, [(1, 0), (1, )], [4, 0]),
@@ -58,8 +128,103 @@ INF = float('inf')
     (GRAPH5, 1, [(1, ), (1, ), (1, )], [INF, 0, INF]),
     (GRAPH5, 2, [(2, ), (2, ), (2, )], [INF, INF, 0]),
 ])
-def test_graph_full_traversal(adj_matrix, start, paths, paths_weights):
-    assert dijkstra(adj_matrix, start) == (paths, paths_weights)
+def test_graph_full_traversal(adj_matrix, start, paths, paths_weights, engine, graph_format):
+    assert dijkstra(graph_format(adj_matrix), start, engine=engine) == (paths, paths_weights)
+
+
+@pytest.mark.parametrize('adj_matrix, start', [
+    (GRAPH2, 2),
+    (GRAPH3, 1),
+    (GRAPH4, 0),
+    (GRAPH5, 0),
+])
+def test_lazy_paths_equal_to_full_paths(adj_matrix, start, engine):
+    lazy_paths, lazy_paths_weights = dijkstra(adj_matrix, start, engine=engine, lazy_paths=True)
+    paths, paths_weights = dijkstra(adj_matrix, start, engine=engine)
+    assert isinstance(lazy_paths, PredecessorPaths)
+    assert (list(lazy_paths), lazy_paths_weights) == (paths, paths_weights)
+
+
+def test_engines_on_random_graph(engine, graph_format):
+    for start in range(0, 60, 7):
+        assert dijkstra(graph_format(GRAPH6), start, engine=engine) == dijkstra(GRAPH6, start)
+
+
+def test_engines_break_ties_equally(engine, graph_format):
+    # Weights 1 and 2 make many equally short paths.
+    for seed in range(20):
+        random.seed(seed)
+        graph = [[random.randint(1, 2) if random.random() < 0.1 else 0 for _ in range(50)] for _ in range(50)]
+        for start, finish in [(0, None), (seed, 49 - seed)]:
+            assert dijkstra(graph_format(graph), start, finish, engine=engine) == dijkstra(graph, start, finish)
+
+
+@pytest.mark.parametrize('vertex, path', [
+    (0, (1, 3, 2, 0)),
+    (1, (1, )),
+    (3, (1, 3)),
+])
+def test_lazy_path_to_single_vertex(vertex, path):
+    assert dijkstra(GRAPH3, 1, lazy_paths=True)[0][vertex] == path
+
+
+def test_predecessor_paths_unreachable_vertex():
+    # Vertex 2 is unreachable from 0.
+    assert PredecessorPaths(0, [None, 0, None])[2] == (0, )
+
+
+@pytest.mark.parametrize('adj_matrix, start, finish, path, path_weight', [
+    (GRAPH1, 1, 0, (1, 0), 4),
+    (GRAPH2, 0, 2, (0, 1, 2), 4),
+    (GRAPH3, 3, 0, (3, 2, 0), 7),
+    (GRAPH4, 0, 1, (0, ), INF),
+    (GRAPH5, 0, 2, (0, 2), 5),
+])
+def test_find_shortest_path_to_finish_and_its_weight(adj_matrix, start, finish, path, path_weight, engine,
+                                                     graph_format):
+    assert dijkstra(graph_format(adj_matrix), start, finish, engine) == (path, path_weight)
+
+
+@pytest.mark.parametrize('adj_list, paths, paths_weights', [
+    # Zero weight edges are present edges in adjacency list.
+    ([[(1, 0)], []], [(0, ), (0, 1)], [0, 0]),
+    # Vertices without edges.
+    ([[], [], []], [(0, ), (0, ), (0, )], [0, INF, INF]),
+])
+def test_adjacency_list_specific_graphs(adj_list, paths, paths_weights, engine):
+    assert dijkstra(adj_list, 0, engine=engine) == (paths, paths_weights)
+
+
+def test_unknown_engine_raise_error():
+    with pytest.raises(ValueError):
+        dijkstra(GRAPH1, 0, engine='unknown')
+
+
+@pytest.mark.parametrize('adj_matrix, start, finish, path, path_weight', [
+    (GRAPH1, 1, 0, (1, 0), 4),
+    (GRAPH2, 0, 2, (0, 1, 2), 4),
+    (GRAPH3, 3, 0, (3, 2, 0), 7),
+    (GRAPH3, 0, 3, (0, 2, 1, 3), 6),
+    (GRAPH3, 2, 2, (2, ), 0),
+    (GRAPH4, 0, 1, (0, ), INF),
+    (GRAPH5, 0, 2, (0, 2), 5),
+    (GRAPH5, 2, 0, (2, ), INF),
+])
+def test_bidirectional_search(adj_matrix, start, finish, path, path_weight, graph_format):
+    assert dijkstra(graph_format(adj_matrix), start, finish, bidirectional=True) == (path, path_weight)
+
+
+@pytest.mark.parametrize('start, finish', [(0, 59), (5, 17), (42, 3), (30, 31)])
+def test_bidirectional_search_finds_shortest_path_weight(start, finish, graph_format):
+    graph = graph_format(GRAPH6)
+    path, path_weight = dijkstra(graph, start, finish, bidirectional=True)
+    assert path_weight == dijkstra(graph, start, finish, engine='heap')[1]
+    assert sum(GRAPH6[parent][child] for parent, child in zip(path, path[1:])) == path_weight
+
+
+def test_bidirectional_search_without_finish_raise_error():
+    with pytest.raises(ValueError):
+        dijkstra(GRAPH1, 0, bidirectional=True)
 
 
 @pytest.mark.parametrize('adj_matrix, start, finish, path, path_weight', [
@@ -69,5 +234,166 @@ def test_graph_full_traversal(adj_matrix, start, paths, paths_weights):
     (GRAPH4, 0, 1, (0, ), INF),
     (GRAPH5, 0, 2, (0, 2), 5),
 ])
-def test_find_shortest_path_to_finish_and_its_weight(adj_matrix, start, finish, path, path_weight):
-    assert dijkstra(adj_matrix, start, finish) == (path, path_weight)
+def test_a_star_with_zero_heuristic(adj_matrix, start, finish, path, path_weight, graph_format):
+    assert a_star(graph_format(adj_matrix), start, finish) == (path, path_weight)
+
+
+@pytest.mark.parametrize('heuristic', [
+    zero_heuristic,
+    euclidean_heuristic(GRID_COORDINATES),
+    manhattan_heuristic(GRID_COORDINATES),
+])
+@pytest.mark.parametrize('start, finish', [(0, 24), (4, 20), (12, 12), (7, 18)])
+def test_a_star_finds_shortest_path_weight(heuristic, start, finish):
+    assert a_star(GRID, start, finish, heuristic)[1] == dijkstra(GRID, start, finish, engine='heap')[1]
+
+
+@pytest.mark.parametrize('heuristic, estimation', [
+    (zero_heuristic, 0),
+    (euclidean_heuristic([(0, 0), (3, 4)]), 5),
+    (manhattan_heuristic([(0, 0), (3, 4)]), 7),
+])
+def test_heuristics(heuristic, estimation):
+    assert heuristic(0, 1) == estimation
+
+
+@pytest.mark.parametrize('adj_matrix, queries', [
+    (GRAPH3, [(0, 3), (1, None), (1, 0), (3, 3), (2, 1), (0, 3)]),
+    (GRAPH5, [(0, 2), (1, 2), (2, None)]),
+    (GRAPH6, [(start, (start * 7) % 60) for start in range(0, 60, 3)] + [(5, None), (5, 17)]),
+])
+def test_batch_dijkstra(adj_matrix, queries, graph_format):
+    expected = [dijkstra(adj_matrix, start, finish) for start, finish in queries]
+    assert batch_dijkstra(graph_format(adj_matrix), queries, max_workers=2) == expected
+
+
+def test_batch_dijkstra_results_are_not_shared():
+    (paths, paths_weights), (other_paths, other_paths_weights) = batch_dijkstra(GRAPH3, [(1, None), (1, None)])
+    paths_weights[0] = None
+    assert other_paths is not paths and other_paths_weights == dijkstra(GRAPH3, 1)[1]
+
+
+@pytest.mark.parametrize('adj_matrix, start, finish', [
+    (GRAPH2, 2, None),
+    (GRAPH3, 1, None),
+    (GRAPH3, 3, 0),
+    (GRAPH5, 0, 2),
+])
+def test_shortest_path_index_query(adj_matrix, start, finish, graph_format):
+    index = ShortestPathIndex(graph_format(adj_matrix))
+    assert index.query(start, finish) == dijkstra(adj_matrix, start, finish)
+    # Second query is answered from cache.
+    assert index.query(start, finish) == dijkstra(adj_matrix, start, finish)
+
+
+def test_shortest_path_index_builds_trees_without_copying_graph(monkeypatch):
+    index = ShortestPathIndex(GRAPH6)
+    # Trees are grown over index own edges, not by dijkstra() over a copy of the graph.
+    monkeypatch.setattr(dijkstra_algorithm, 'dijkstra', None)
+    for start in range(0, 60, 7):
+        assert index.query(start) == dijkstra(GRAPH6, start)
+
+
+def test_shortest_path_index_drops_least_recently_used_tree():
+    index = ShortestPathIndex(GRAPH3, max_trees=2)
+    index.query(0)
+    index.query(1)
+    index.query(0)
+    index.query(2)
+    assert (len(index), 0 in index, 1 in index, 2 in index) == (2, True, False, True)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_shortest_path_index_repairs_trees_on_edge_updates(seed):
+    generator = random.Random(seed)
+    adj_matrix = [row[:] for row in GRAPH6]
+    starts = [0, 13, 27, 42]
+    index = ShortestPathIndex(adj_matrix)
+    for start in starts:
+        index.query(start)
+
+    for _ in range(30):
+        parent_vertex, child_vertex = generator.randrange(60), generator.randrange(60)
+        if parent_vertex == child_vertex:
+            continue
+        # Removes edge with weight None, otherwise changes or adds it.
+        weight = generator.choice([None, 1, 2, 5, 9, 20])
+        adj_matrix[parent_vertex][child_vertex] = weight or 0
+        index.update_edge(parent_vertex, child_vertex, weight)
+
+        for start in starts:
+            assert start in index
+            paths, paths_weights = index.query(start)
+            assert paths_weights == dijkstra(adj_matrix, start, engine='heap')[1]
+            for vertex, path in enumerate(paths):
+                if paths_weights[vertex] != INF:
+                    assert sum(adj_matrix[a][b] for a, b in zip(path, path[1:])) == paths_weights[vertex]
+
+
+def test_numpy_engine_accepts_numpy_matrix():
+    np = pytest.importorskip('numpy')
+    for start in range(0, 60, 7):
+        assert dijkstra(np.array(GRAPH6), start, engine='numpy') == dijkstra(GRAPH6, start)
+
+
+@pytest.mark.parametrize('adj_matrix', [GRAPH1, GRAPH2, GRAPH3, GRAPH4, GRAPH5, GRAPH6])
+def test_all_pairs_shortest_paths(adj_matrix, all_pairs_method, graph_format):
+    distances = all_pairs_shortest_paths(graph_format(adj_matrix), all_pairs_method)
+    assert [list(row) for row in distances] == [dijkstra(adj_matrix, start)[1] for start in range(len(adj_matrix))]
+
+
+def test_all_pairs_shortest_paths_in_process_pool():
+    distances = all_pairs_shortest_paths(GRAPH6, 'johnson', max_workers=2)
+    assert [list(row) for row in distances] == [dijkstra(GRAPH6, start)[1] for start in range(len(GRAPH6))]
+
+
+def test_all_pairs_shortest_paths_with_negative_edges(all_pairs_method, graph_format):
+    distances = all_pairs_shortest_paths(graph_format(GRAPH7), all_pairs_method)
+    assert [list(row) for row in distances] == [
+        [0, -1, 2, 1],
+        [INF, 0, INF, 2],
+        [INF, -3, 0, -1],
+        [INF, INF, INF, 0],
+    ]
+
+
+def test_all_pairs_shortest_paths_with_negative_cycle_raise_error(all_pairs_method, graph_format):
+    with pytest.raises(ValueError):
+        all_pairs_shortest_paths(graph_format(GRAPH8), all_pairs_method)
+
+
+def test_all_pairs_shortest_paths_unknown_method_raise_error():
+    with pytest.raises(ValueError):
+        all_pairs_shortest_paths(GRAPH1, 'unknown')
+
+
+@pytest.mark.parametrize('adj_matrix, start', [
+    (GRAPH2, 2),
+    (GRAPH3, 0),
+    (GRAPH5, 0),
+    (GRAPH6, 11),
+])
+def test_iter_dijkstra(adj_matrix, start, graph_format):
+    records = list(iter_dijkstra(graph_format(adj_matrix), start))
+    paths, paths_weights = dijkstra(adj_matrix, start)
+    # Vertices are visited in non-decreasing weights order.
+    assert [weight for _, weight, _ in records] == sorted(weight for _, weight, _ in records)
+    assert {vertex: (weight, path) for vertex, weight, path in records} == {
+        vertex: (paths_weights[vertex], paths[vertex]) for vertex in range(len(adj_matrix))
+        if paths_weights[vertex] != INF
+    }
+
+
+def test_iter_dijkstra_stops_early():
+    records = iter_dijkstra(GRAPH3, 0)
+    assert [next(records), next(records)] == [(0, 0, (0, )), (2, 2, (0, 2))]
+
+
+def test_iter_friendly_output():
+    lines = list(iter_friendly_output(GRAPH3, 0))
+    assert lines == [
+        'From 0 to 2 (weight: 2): 0 --> 2',
+        'From 0 to 1 (weight: 5): 0 --> 2 --> 1',
+        'From 0 to 3 (weight: 6): 0 --> 2 --> 1 --> 3',
+    ]
+    assert sorted(lines) == friendly_output(GRAPH3, 0, *dijkstra(GRAPH3, 0), None).split('\n')
@@ -3,8 +3,14 @@ Tests on BFS and DFS algorithms.
 Graphs are represented as adjacency lists.
 """
 
+import random
 import pytest
-from algorithms.graph_traversals import breadth_first_search, depth_first_search
+from algorithms.csr_graph import CSRGraph
+from algorithms.graph_traversals import (
+    breadth_first_search, parallel_breadth_first_search, depth_first_search, iter_bfs, iter_dfs, path_from_parents,
+    VisitedBitmap, multi_source_bfs, is_reachable, connected_components, strongly_connected_components, topological_sort,
+    reverse_index
+)
 
 
 # Connected graphs.
@@ -18,6 +24,11 @@ GRAPH3 = [[1, 2], [0, 4], [0, 3, 4], [2, 4], [1, 2, 3]]
 GRAPH4 = [[1], [0], []]
 GRAPH5 = [[1, 2], [2], [0], [4], []]
 
+# Random low-diameter graph, large enough for bottom-up steps.
+
+random.seed(0)
+GRAPH6 = [random.sample(range(300), 20) for _ in range(300)] + [[] for _ in range(20)]
+
 
 @pytest.mark.parametrize('adj_list, start, paths', [
     (GRAPH1, 0, {0: [0], 1: [0, 1]}),
@@ -43,6 +54,40 @@ def test_bfs_full_traversal(adj_list, start, paths):
     assert breadth_first_search(adj_list, start) == paths
 
 
+@pytest.mark.parametrize('adj_list, start, parents', [
+    (GRAPH1, 0, [None, 0]),
+    (GRAPH3, 1, [1, None, 0, 4, 1]),
+    (GRAPH3, 3, [2, 4, 3, None, 3]),
+    (GRAPH4, 2, [None, None, None]),
+    (GRAPH5, 1, [2, None, 1, None, None]),
+])
+def test_bfs_parents(adj_list, start, parents):
+    assert breadth_first_search(adj_list, start, output='parents') == parents
+
+
+@pytest.mark.parametrize('adj_list, start, distances', [
+    (GRAPH1, 0, [0, 1]),
+    (GRAPH3, 1, [1, 0, 2, 2, 1]),
+    (GRAPH3, 3, [2, 2, 1, 0, 1]),
+    (GRAPH4, 2, [None, None, 0]),
+    (GRAPH5, 1, [2, 0, 1, None, None]),
+])
+def test_bfs_distances(adj_list, start, distances):
+    assert breadth_first_search(adj_list, start, output='distances') == distances
+
+
+@pytest.mark.parametrize('adj_list', [GRAPH2, GRAPH3, GRAPH5])
+def test_path_from_parents_equal_to_bfs_paths(adj_list):
+    for start in range(len(adj_list)):
+        parents, paths = breadth_first_search(adj_list, start, output='parents'), breadth_first_search(adj_list, start)
+        assert all(path_from_parents(parents, start, vertex) == paths[vertex] for vertex in range(len(adj_list)))
+
+
+def test_bfs_unknown_output_raise_error():
+    with pytest.raises(ValueError):
+        breadth_first_search(GRAPH1, 0, output='unknown')
+
+
 @pytest.mark.parametrize('adj_list, start, finish, path', [
     (GRAPH1, 0, 1, [0, 1]),
     (GRAPH2, 1, 0, [1, 2, 0]),
@@ -99,3 +144,282 @@ def test_bfs_path_between_start_and_finish_doesnt_exist(adj_list, start, finish)
 ])
 def test_dfs_visit_all_reachable_vertices(adj_list, start, visited):
     assert depth_first_search(adj_list, start) == visited
+
+
+def test_bfs_each_vertex_is_enqueued_once():
+    # Complete graph: every vertex is a neighbor of all others.
+    complete_graph = [[neighbor for neighbor in range(50) if neighbor != vertex] for vertex in range(50)]
+    paths = breadth_first_search(complete_graph, 0)
+    assert all(paths[vertex] == [0, vertex] for vertex in range(1, 50))
+
+
+@pytest.mark.parametrize('adj_list', [GRAPH1, GRAPH2, GRAPH3, GRAPH4, GRAPH5, GRAPH6])
+def test_direction_optimizing_bfs_distances(adj_list):
+    for start in range(0, len(adj_list), 7):
+        assert breadth_first_search(adj_list, start, output='distances', direction_optimizing=True) == \
+               breadth_first_search(adj_list, start, output='distances')
+
+
+@pytest.mark.parametrize('adj_list', [GRAPH3, GRAPH5, GRAPH6])
+def test_direction_optimizing_bfs_paths(adj_list):
+    graph = CSRGraph.from_adj_list(adj_list)
+    for start in range(0, len(adj_list), 11):
+        paths = breadth_first_search(graph, start, direction_optimizing=True)
+        expected_paths = breadth_first_search(adj_list, start)
+        for vertex, path in paths.items():
+            assert path[0] == start and len(path) == len(expected_paths[vertex])
+            assert all(child in adj_list[parent] for parent, child in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize('adj_list, start, finish, path', [
+    (GRAPH1, 0, 1, [0, 1]),
+    (GRAPH2, 1, 0, [1, 2, 0]),
+    (GRAPH3, 3, 1, [3, 4, 1]),
+    (GRAPH5, 3, 4, [3, 4]),
+    (GRAPH5, 3, 3, [3]),
+    (GRAPH5, 3, 0, 'No path from 3 to 0'),
+])
+def test_direction_optimizing_bfs_with_finish(adj_list, start, finish, path):
+    assert breadth_first_search(adj_list, start, finish, direction_optimizing=True) == path
+
+
+@pytest.mark.parametrize('adj_list', [GRAPH3, GRAPH5])
+def test_bfs_accepts_csr_graph(adj_list):
+    for start in range(len(adj_list)):
+        paths = breadth_first_search(CSRGraph.from_adj_list(adj_list), start)
+        assert {vertex: list(path) for vertex, path in paths.items()} == breadth_first_search(adj_list, start)
+
+
+@pytest.mark.parametrize('adj_list', [GRAPH3, GRAPH5, GRAPH6])
+def test_parallel_bfs(adj_list):
+    for start in range(0, len(adj_list), 13):
+        assert parallel_breadth_first_search(adj_list, start, output='distances', max_workers=2) == \
+               breadth_first_search(adj_list, start, output='distances')
+
+        paths = parallel_breadth_first_search(adj_list, start, max_workers=2)
+        expected_paths = breadth_first_search(adj_list, start)
+        for vertex, path in paths.items():
+            assert path[0] == start and len(path) == len(expected_paths[vertex])
+            assert all(child in adj_list[parent] for parent, child in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize('adj_list, start, finish, path', [
+    (GRAPH3, 3, 1, [3, 4, 1]),
+    (GRAPH5, 3, 3, [3]),
+    (GRAPH5, 3, 0, 'No path from 3 to 0'),
+])
+def test_parallel_bfs_with_finish(adj_list, start, finish, path):
+    assert parallel_breadth_first_search(adj_list, start, finish, max_workers=2) == path
+
+
+@pytest.mark.parametrize('adj_list, start, order', [
+    (GRAPH2, 1, [1, 2, 0]),
+    (GRAPH3, 0, [0, 1, 2, 4, 3]),
+    (GRAPH5, 0, [0, 1, 2]),
+    (GRAPH5, 3, [3, 4]),
+])
+def test_iter_bfs_order(adj_list, start, order):
+    assert list(iter_bfs(adj_list, start)) == order
+
+
+@pytest.mark.parametrize('adj_list', [GRAPH3, GRAPH5, GRAPH6])
+def test_iter_bfs_details(adj_list):
+    for start in range(0, len(adj_list), 7):
+        paths = breadth_first_search(adj_list, start)
+        for vertex, depth, parent in iter_bfs(adj_list, start, details=True):
+            assert depth == len(paths[vertex]) - 1
+            assert parent == (paths[vertex][-2] if depth else None)
+
+
+@pytest.mark.parametrize('adj_list, start, order', [
+    (GRAPH2, 1, [1, 2, 0]),
+    (GRAPH3, 0, [0, 2, 4, 3, 1]),
+    (GRAPH5, 0, [0, 2, 1]),
+    (GRAPH5, 3, [3, 4]),
+])
+def test_iter_dfs_order(adj_list, start, order):
+    assert list(iter_dfs(adj_list, start)) == order
+
+
+def test_iter_dfs_details():
+    assert list(iter_dfs(GRAPH3, 0, details=True)) == [(0, 0, None), (2, 1, 0), (4, 2, 2), (3, 3, 4), (1, 3, 4)]
+
+
+def test_iterators_stop_early():
+    bfs, dfs = iter_bfs(GRAPH6, 0), iter_dfs(GRAPH6, 0)
+    assert [next(bfs), next(dfs)] == [0, 0]
+
+
+@pytest.mark.parametrize('adj_list', [GRAPH3, GRAPH4, GRAPH5, GRAPH6])
+def test_compact_visited(adj_list):
+    for start in range(0, len(adj_list), 3):
+        assert breadth_first_search(adj_list, start, compact_visited=True) == breadth_first_search(adj_list, start)
+        assert list(iter_bfs(adj_list, start, compact_visited=True)) == list(iter_bfs(adj_list, start))
+        assert list(iter_dfs(adj_list, start, compact_visited=True)) == list(iter_dfs(adj_list, start))
+
+        visited = depth_first_search(adj_list, start, compact_visited=True)
+        assert isinstance(visited, VisitedBitmap)
+        assert (set(visited), len(visited)) == (depth_first_search(adj_list, start), len(depth_first_search(adj_list, start)))
+
+
+def test_visited_bitmap():
+    visited = VisitedBitmap(20)
+    for vertex in [0, 7, 8, 19, 7]:
+        visited.add(vertex)
+    assert (list(visited), len(visited), 8 in visited, 9 in visited) == ([0, 7, 8, 19], 4, True, False)
+
+
+@pytest.mark.parametrize('adj_list, components', [
+    (GRAPH1, [[0, 1]]),
+    (GRAPH3, [[0, 1, 2, 3, 4]]),
+    (GRAPH4, [[0, 1], [2]]),
+    (GRAPH5, [[0, 1, 2], [3, 4]]),
+    ([[], [], []], [[0], [1], [2]]),
+    # Edges are treated as undirected.
+    ([[], [0], [1], []], [[0, 1, 2], [3]]),
+])
+def test_connected_components(adj_list, components):
+    assert connected_components(adj_list) == components
+
+
+@pytest.mark.parametrize('adj_list, components', [
+    (GRAPH1, [{0, 1}]),
+    (GRAPH2, [{0, 1, 2}]),
+    (GRAPH4, [{0, 1}, {2}]),
+    (GRAPH5, [{0, 1, 2}, {3}, {4}]),
+    ([[1], [2], []], [{0}, {1}, {2}]),
+    ([[1], [2, 3], [0], [4], [5], [3]], [{0, 1, 2}, {3, 4, 5}]),
+])
+def test_strongly_connected_components(adj_list, components):
+    result = strongly_connected_components(adj_list)
+    assert sorted(map(sorted, result)) == sorted(map(sorted, components))
+    # Reverse topological order: edges never lead to later components.
+    component_index = {vertex: i for i, component in enumerate(result) for vertex in component}
+    assert all(component_index[neighbor] <= component_index[vertex]
+               for vertex in range(len(adj_list)) for neighbor in adj_list[vertex])
+
+
+def test_strongly_connected_components_without_recursion_limit():
+    # Single cycle, much longer than default recursion limit.
+    long_cycle = [[(vertex + 1) % 5000] for vertex in range(5000)]
+    assert [sorted(component) for component in strongly_connected_components(long_cycle)] == [list(range(5000))]
+
+
+@pytest.mark.parametrize('adj_list', [
+    [[1, 2], [3], [3], []],
+    [[], [0], [0, 1], []],
+    [[] for _ in range(5)],
+    [[(vertex + 1)] for vertex in range(4999)] + [[]],
+])
+def test_topological_sort(adj_list):
+    order = topological_sort(adj_list)
+    position = {vertex: i for i, vertex in enumerate(order)}
+    assert sorted(order) == list(range(len(adj_list)))
+    assert all(position[vertex] < position[neighbor] for vertex in range(len(adj_list)) for neighbor in adj_list[vertex])
+
+
+@pytest.mark.parametrize('adj_list', [GRAPH1, GRAPH2, [[1], [2], [1]]])
+def test_topological_sort_of_graph_with_cycle_raise_error(adj_list):
+    with pytest.raises(ValueError):
+        topological_sort(adj_list)
+
+
+@pytest.mark.parametrize('adj_list, sources, distances', [
+    (GRAPH3, [0], [0, 1, 1, 2, 2]),
+    (GRAPH3, [0, 3], [0, 1, 1, 0, 1]),
+    (GRAPH5, [1, 4], [2, 0, 1, None, 0]),
+    (GRAPH5, [3, 3], [None, None, None, 0, 1]),
+    (GRAPH5, [], [None, None, None, None, None]),
+])
+def test_multi_source_bfs_distances(adj_list, sources, distances):
+    assert multi_source_bfs(adj_list, sources) == distances
+
+
+def test_multi_source_bfs_parents():
+    assert multi_source_bfs(GRAPH3, [0, 3], output='parents') == [None, 0, 0, None, 3]
+
+
+def test_multi_source_bfs_equal_to_bfs_distances_minimum():
+    sources = [5, 77, 150]
+    distances = [breadth_first_search(GRAPH6, source, output='distances') for source in sources]
+    assert multi_source_bfs(GRAPH6, sources) == [
+        min((d[vertex] for d in distances if d[vertex] is not None), default=None) for vertex in range(len(GRAPH6))
+    ]
+
+
+@pytest.mark.parametrize('adj_list, sources, targets, path', [
+    (GRAPH3, [0], [3], [0, 2, 3]),
+    (GRAPH3, [0, 4], [3], [4, 3]),
+    (GRAPH3, [1], [3, 2], [1, 0, 2]),
+    (GRAPH5, [3], [3, 4], [3]),
+    (GRAPH5, [0, 3], [4], [3, 4]),
+    (GRAPH5, [4], [0, 1], 'No path from [4] to [0, 1]'),
+])
+def test_multi_source_bfs_with_targets(adj_list, sources, targets, path):
+    assert multi_source_bfs(adj_list, sources, targets) == path
+
+
+@pytest.mark.parametrize('adj_list, sources, targets, reachable', [
+    (GRAPH3, [0], [3], True),
+    (GRAPH5, [0, 1], [3, 4], False),
+    (GRAPH5, [0, 3], [4], True),
+    (GRAPH5, [4], [], False),
+])
+def test_is_reachable(adj_list, sources, targets, reachable):
+    assert is_reachable(adj_list, sources, targets) == reachable
+
+
+def test_multi_source_bfs_unknown_output_raise_error():
+    with pytest.raises(ValueError):
+        multi_source_bfs(GRAPH1, [0], output='paths')
+
+
+@pytest.mark.parametrize('adj_list', [GRAPH1, GRAPH2, GRAPH3, GRAPH4, GRAPH5, GRAPH6])
+def test_bidirectional_bfs_paths(adj_list):
+    for start in range(0, len(adj_list), 7):
+        for finish in range(0, len(adj_list), 11):
+            path = breadth_first_search(adj_list, start, finish, bidirectional=True)
+            expected_path = breadth_first_search(adj_list, start, finish)
+            if isinstance(expected_path, str):
+                assert path == expected_path
+            else:
+                # Shortest paths may differ, but not their lengths.
+                assert len(path) == len(expected_path)
+                assert path[0] == start and path[-1] == finish
+                assert all(child in adj_list[parent] for parent, child in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize('adj_list, start, finish, path', [
+    (GRAPH3, 0, 3, [0, 2, 3]),
+    (GRAPH3, 3, 3, [3]),
+    (GRAPH5, 3, 4, [3, 4]),
+    (GRAPH5, 4, 3, 'No path from 4 to 3'),
+])
+def test_bidirectional_bfs_with_csr_graph(adj_list, start, finish, path):
+    assert breadth_first_search(CSRGraph.from_adj_list(adj_list), start, finish, bidirectional=True) == path
+
+
+def test_bidirectional_bfs_without_finish_raise_error():
+    with pytest.raises(ValueError):
+        breadth_first_search(GRAPH1, 0, bidirectional=True)
+
+
+@pytest.mark.parametrize('adj_list, reversed_adj_list', [
+    (GRAPH3, [[1, 2], [0, 4], [0, 3, 4], [2, 4], [1, 2, 3]]),
+    (GRAPH5, [[2], [0], [0, 1], [], [3]]),
+])
+def test_reverse_index(adj_list, reversed_adj_list):
+    assert [sorted(row) for row in reverse_index(adj_list)] == reversed_adj_list
+
+
+def test_reverse_index_of_csr_graph_is_cached():
+    graph = CSRGraph.from_adj_list(GRAPH5)
+    assert reverse_index(graph) is reverse_index(graph)
+
+
+def test_bidirectional_bfs_with_reverse_adj_list():
+    reversed_adj_list = reverse_index(GRAPH6)
+    for start in range(0, len(GRAPH6), 13):
+        for finish in range(0, len(GRAPH6), 17):
+            assert breadth_first_search(GRAPH6, start, finish, bidirectional=True, reverse_adj_list=reversed_adj_list) \
+                   == breadth_first_search(GRAPH6, start, finish, bidirectional=True)
@@ -7,10 +7,18 @@ or there it should be empty.
 2, 3) Hash table with collisions and hash table without collisions.
 These two are main testing objects, and almost every single test in this module
 runs both of them to ensure all methods works correctly in both cases.
+4) Open addressing hash table with collisions, which runs the same tests.
+5) Hash table with native hashing, which runs the same tests.
 """
 
+import random
+import sys
+from decimal import Decimal
+from fractions import Fraction
 import pytest
-from algorithms.hash_table import HashTable
+from algorithms.hash_table import (
+    HashTable, OpenAddressingHashTable, MIGRATION_STEP, MIN_CAPACITY, _EMPTY, _DELETED, _native_hash, _native_hash_ints
+)
 
 
 # Constants.
@@ -37,8 +45,20 @@ def filled_table_without_collisions():
     return HashTable(INITIAL_ITEMS, 5)
 
 
+@pytest.fixture
+def filled_open_addressing_table():
+    return HashTable(INITIAL_ITEMS, 4, storage='open_addressing')
+
+
+@pytest.fixture
+def filled_native_hashing_table():
+    return HashTable(INITIAL_ITEMS, 4, hashing='native')
+
+
 @pytest.fixture(params=['filled_table_with_collisions',
-                        'filled_table_without_collisions'])
+                        'filled_table_without_collisions',
+                        'filled_open_addressing_table',
+                        'filled_native_hashing_table'])
 def filled_table(request):
     return request.getfixturevalue(request.param)
 
@@ -59,6 +79,12 @@ def test_filled_table_without_collisions(filled_table_without_collisions):
     assert len(filled_cells) == len(INITIAL_ITEMS)
 
 
+def test_open_addressing_table_has_collisions(filled_open_addressing_table):
+    """Checks if some keys of this table are not in their home cells."""
+    table = filled_open_addressing_table
+    assert any(table._hash(key) != index for index, key in enumerate(table._array) if key in INITIAL_KEYS)
+
+
 @pytest.mark.parametrize('key', [1, 345, 567821345, 0, -12, 'text', '', (1, 2, 3, 4), (), True, False, None])
 def test_hashing_of_hashable_keys(empty_table, key):
     assert isinstance(empty_table._hash(key), int)
@@ -264,3 +290,346 @@ def test_pop_by_existing_key_return_correct_value(filled_table, key):
 def test_pop_by_non_existing_key_raise_error(filled_table, key):
     with pytest.raises(KeyError):
         filled_table.pop(key)
+
+
+def test_open_addressing_storage_creates_subclass_instance():
+    table = HashTable(storage='open_addressing')
+    assert isinstance(table, OpenAddressingHashTable)
+    assert isinstance(table, HashTable)
+
+
+def test_unknown_storage_raise_error():
+    with pytest.raises(ValueError):
+        HashTable(storage='cuckoo')
+
+
+@pytest.mark.parametrize('max_load_factor', [0, 1, 1.5])
+def test_open_addressing_wrong_max_load_factor_raise_error(max_load_factor):
+    with pytest.raises(ValueError):
+        HashTable(max_load_factor=max_load_factor, storage='open_addressing')
+
+
+def test_open_addressing_pop_keeps_probing_sequence():
+    # Key, popped from the middle of probing sequence, must not hide keys after it.
+    for key in INITIAL_KEYS:
+        table = HashTable(INITIAL_ITEMS, 4, storage='open_addressing')
+        table.pop(key)
+        for other_key in INITIAL_KEYS:
+            if other_key != key:
+                assert table[other_key] == dict(INITIAL_ITEMS)[other_key]
+
+
+def test_open_addressing_reuses_tombstones():
+    table = HashTable((), 8, storage='open_addressing')
+    for _ in range(100):
+        table['key'] = 'value'
+        table.pop('key')
+    # Repeated insertion and removal doesn't grow the table.
+    assert len(table._array) == 8
+
+
+@pytest.mark.parametrize('storage', ['chaining', 'open_addressing'])
+@pytest.mark.parametrize('hashing, hash_seed', [('polynomial', None), ('native', None), ('native', 12345)])
+def test_random_operations_equal_to_dict(storage, hashing, hash_seed):
+    random.seed(0)
+    table, expected = HashTable(storage=storage, hashing=hashing, hash_seed=hash_seed), {}
+    for _ in range(2000):
+        key = random.randrange(200)
+        if random.random() < 0.4 and key in expected:
+            assert table.pop(key) == expected.pop(key)
+        else:
+            table[key] = expected[key] = random.random()
+
+    assert len(table) == len(expected)
+    assert dict(table.items()) == expected
+
+
+@pytest.mark.parametrize('hash_seed', [None, 0, -7, 2**100, b'secret'])
+@pytest.mark.parametrize('key', [1, 567821345, -12, 'text', '', (1, 2, 3, 4), (), True, None, 2.5])
+def test_native_hash_is_lower_than_capacity(hash_seed, key):
+    table = HashTable((), 7, hashing='native', hash_seed=hash_seed)
+    assert 0 <= table._hash(key) < len(table._array)
+
+
+@pytest.mark.parametrize('key', [[], {'abc': 123}, {1, 2, 3}, (1, [2])])
+def test_native_hashing_of_unhashable_keys_raise_error(key):
+    with pytest.raises(TypeError):
+        HashTable(hashing='native')._hash(key)
+
+
+def test_native_hashing_spreads_strided_keys():
+    table = HashTable((), 64, hashing='native')
+    # All these keys fall into one bucket if index is hash(key) % 64.
+    assert len(set(table._hash(key * 64) for key in range(64))) > 32
+
+
+def test_seeded_hash_depends_on_seed():
+    keys = range(100)
+    first, second = HashTable(hashing='native', hash_seed=1), HashTable(hashing='native', hash_seed=2)
+    assert [first._hash_value(key) for key in keys] == \
+           [HashTable(hashing='native', hash_seed=1)._hash_value(key) for key in keys]
+    assert [first._hash_value(key) for key in keys] != [second._hash_value(key) for key in keys]
+
+
+@pytest.mark.parametrize('hash_seed', [1, 2, b'x' * 16])
+def test_seeded_hash_separates_keys_with_equal_native_hash(hash_seed):
+    # All these keys have equal hash().
+    keys = [5 + i * (2**61 - 1) for i in range(200)]
+    table = HashTable((), 64, hashing='native', hash_seed=hash_seed)
+    assert len(set(table._hash(key) for key in keys)) > 32
+
+
+@pytest.mark.parametrize('equal_keys', [
+    [1, 1.0, True, Fraction(1), Decimal(1), complex(1, 0)],
+    [0, 0.0, False, -0.0],
+    ['text', 'text'[:]],
+])
+def test_seeded_hash_of_equal_keys(equal_keys):
+    table = HashTable(hashing='native', hash_seed=7)
+    assert len(set(table._hash_value(key) for key in equal_keys)) == 1
+
+    for value, key in enumerate(equal_keys):
+        table[key] = value
+    assert len(table) == 1
+
+
+def test_unknown_hashing_raise_error():
+    with pytest.raises(ValueError):
+        HashTable(hashing='md5')
+
+
+def test_hash_seed_with_polynomial_hashing_raise_error():
+    with pytest.raises(ValueError):
+        HashTable(hash_seed=1)
+
+
+def _old_cells_number(table):
+    # Number of filled buckets (cells), which are not moved to the new array yet.
+    if isinstance(table, OpenAddressingHashTable):
+        return sum(key is not _EMPTY and key is not _DELETED for key in table._old_array)
+    return sum(bucket is not None for bucket in table._old_array)
+
+
+@pytest.mark.parametrize('storage', ['chaining', 'open_addressing'])
+def test_resize_is_incremental(storage):
+    table = HashTable([(key, key) for key in range(48)], 64, storage=storage, hashing='native')
+    table[48] = 48
+    # Capacity is increased at once, but items are still in the old array.
+    assert len(table._array) == 128
+    assert table._old_array is not None
+
+    key = 49
+    while table._old_array is not None:
+        cells_to_move = _old_cells_number(table)
+        table[key] = key
+        key += 1
+        if table._old_array is not None:
+            # Bucket of inserted key may be moved out of turn.
+            assert cells_to_move - _old_cells_number(table) <= MIGRATION_STEP + 1
+        # All items are reachable during resizing.
+        assert all(table[k] == k for k in range(key))
+
+    # Resizing is finished long before the next one is required.
+    assert key <= 49 + 64 // MIGRATION_STEP
+    assert sorted(table) == list(range(key))
+
+
+@pytest.mark.parametrize('storage', ['chaining', 'open_addressing'])
+@pytest.mark.parametrize('max_load_factor', [0.5, 0.75, 0.9])
+@pytest.mark.parametrize('phases', [
+    ['shrink', 'grow', 'shrink', 'grow'],
+    ['shrink', 'shrink', 'shrink'],
+    ['grow', 'shrink', 'shrink', 'grow', 'grow'],
+])
+def test_resize_is_finished_before_next_one(storage, max_load_factor, phases, monkeypatch):
+    table = HashTable.from_items([(key, key) for key in range(2000)], max_load_factor, storage, 'native')
+    keys, new_key = list(range(2000)), 2000
+    unfinished = []
+    resize = HashTable._resize
+    monkeypatch.setattr(HashTable, '_resize', lambda self, capacity: unfinished.append(
+        self._old_array is not None
+    ) or resize(self, capacity))
+
+    for phase in phases:
+        capacity = len(table._array)
+        while len(table._array) == capacity:
+            if phase == 'shrink':
+                table.pop(keys.pop())
+            else:
+                table[new_key] = new_key
+                keys.append(new_key)
+                new_key += 1
+
+    # Every resizing found the previous one finished, so none of them moved all buckets at once.
+    assert len(unfinished) == len(phases)
+    assert not any(unfinished)
+    assert sorted(table) == sorted(keys)
+
+
+@pytest.mark.parametrize('storage', ['chaining', 'open_addressing'])
+def test_capacity_decreases_after_pop(storage):
+    table = HashTable([(key, key) for key in range(1000)], storage=storage, hashing='native')
+    initial_capacity = len(table._array)
+    for key in range(990):
+        table.pop(key)
+
+    assert MIN_CAPACITY <= len(table._array) < initial_capacity / 16
+    assert sorted(table.items()) == [(key, key) for key in range(990, 1000)]
+
+
+def test_capacity_doesnt_decrease_below_minimum():
+    table = HashTable([(key, key) for key in range(100)])
+    for key in range(100):
+        table.pop(key)
+    for _ in range(MIGRATION_STEP * MIN_CAPACITY):
+        table['key'] = 'value'
+        table.pop('key')
+
+    assert len(table._array) == MIN_CAPACITY
+    assert table._old_array is None
+
+
+def test_getitem_and_contains_hash_key_once(filled_table, monkeypatch):
+    calls = []
+    hash_value = filled_table._hash_value
+    monkeypatch.setattr(filled_table, '_hash_value', lambda key: calls.append(key) or hash_value(key))
+
+    assert filled_table['one'] == 1
+    assert 'two' in filled_table
+    assert 'abc' not in filled_table
+    assert calls == ['one', 'two', 'abc']
+
+
+def test_values_contains_doesnt_look_up_keys(filled_table, monkeypatch):
+    calls = []
+    hash_value = filled_table._hash_value
+    monkeypatch.setattr(filled_table, '_hash_value', lambda key: calls.append(key) or hash_value(key))
+
+    assert 1 in filled_table.values()
+    assert 'abc' not in filled_table.values()
+    assert calls == []
+
+
+def test_getitem_of_none_value():
+    table = HashTable([('key', None)])
+    assert table['key'] is None
+    assert 'key' in table
+
+
+def test_views_are_live(filled_table):
+    keys, values, items = filled_table.keys(), filled_table.values(), filled_table.items()
+    filled_table['four'] = 4
+    filled_table.pop('one')
+
+    assert len(keys) == len(values) == len(items) == len(INITIAL_ITEMS)
+    assert 'four' in keys and 'one' not in keys
+    assert 4 in values and 1 not in values
+    assert ('four', 4) in items and ('one', 1) not in items
+
+
+def test_views_support_set_operations(filled_table):
+    assert filled_table.keys() & {'one', 'abc'} == {'one'}
+    assert filled_table.items() - {('one', 1)} == set(INITIAL_ITEMS[1:])
+
+
+@pytest.mark.parametrize('storage', ['chaining', 'open_addressing'])
+def test_views_during_resize(storage):
+    table = HashTable([(key, key) for key in range(48)], 64, storage=storage, hashing='native')
+    table[48] = 48
+    assert table._old_array is not None
+    assert sorted(table.keys()) == sorted(table.values()) == list(range(49))
+    assert sorted(table.items()) == [(key, key) for key in range(49)]
+
+
+@pytest.mark.parametrize('storage', ['chaining', 'open_addressing'])
+@pytest.mark.parametrize('hashing', ['polynomial', 'native'])
+def test_from_items(storage, hashing, monkeypatch):
+    resizes = []
+    monkeypatch.setattr(HashTable, '_resize', lambda self, capacity: resizes.append(capacity))
+    items = [(key, str(key)) for key in range(1000)] + [('abc', 1), ('abc', 2)]
+    table = HashTable.from_items(items, storage=storage, hashing=hashing)
+
+    assert resizes == []
+    assert isinstance(table, OpenAddressingHashTable) == (storage == 'open_addressing')
+    # Repeated key gets the last value.
+    assert dict(table.items()) == dict(items)
+
+
+@pytest.mark.parametrize('dict_argument', [{}, {1: 2, 3: 4, 5: 6}, {'a': 'b'}])
+def test_from_items_with_dict_argument(dict_argument):
+    assert dict(HashTable.from_items(dict_argument).items()) == dict_argument
+
+
+@pytest.mark.parametrize('wrong_iterable', [(1, ), {1, 2, 3, 4}, [(1, 2), (3, 4), (5, )]])
+def test_put_many_with_wrong_format_argument_raise_error(wrong_iterable):
+    with pytest.raises(TypeError):
+        HashTable().put_many(wrong_iterable)
+
+
+def test_put_many(filled_table, monkeypatch):
+    resizes = []
+    resize = HashTable._resize
+    monkeypatch.setattr(HashTable, '_resize', lambda self, capacity: resizes.append(capacity) or resize(self, capacity))
+    items = {str(key): key for key in range(100)}
+    items['one'] = 'New value'
+    filled_table.put_many(items)
+
+    # Table is resized only once, before insertion.
+    assert len(resizes) == 1
+    assert filled_table._old_array is None
+    assert dict(filled_table.items()) == dict(INITIAL_ITEMS, **items)
+
+
+def test_get_many(filled_table):
+    keys = INITIAL_KEYS + NON_EXISTING_KEYS
+    expected_values = [dict(INITIAL_ITEMS)[key] for key in INITIAL_KEYS] + ['default'] * len(NON_EXISTING_KEYS)
+    assert filled_table.get_many(iter(keys), 'default') == expected_values
+
+
+@pytest.mark.parametrize('storage', ['chaining', 'open_addressing'])
+@pytest.mark.parametrize('hash_seed', [None, 1])
+def test_get_many_of_int_keys(storage, hash_seed):
+    table = HashTable.from_items([(key, key) for key in range(-500, 500, 3)],
+                                 storage=storage, hashing='native', hash_seed=hash_seed)
+    keys = list(range(-600, 600))
+    assert table.get_many(keys) == [table.get(key) for key in keys]
+
+
+def test_vectorized_native_hash_equal_to_native_hash():
+    pytest.importorskip('numpy')
+    random.seed(0)
+    keys = [0, 1, -1, -2, 2**61 - 2, -(2**61 - 2)] + [random.randrange(-2**61 + 2, 2**61 - 2) for _ in range(1000)]
+    assert _native_hash_ints(keys) == [_native_hash(key) for key in keys]
+
+
+@pytest.mark.parametrize('keys', [[2**61], [-(2**61)], [1, 2**70]])
+def test_vectorized_native_hash_of_big_keys_return_none(keys):
+    pytest.importorskip('numpy')
+    assert _native_hash_ints(keys) is None
+
+
+def test_batch_hashing_without_numpy(monkeypatch):
+    # None in sys.modules makes import fail.
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    table = HashTable(hashing='native')
+    keys = list(range(-50, 50))
+    assert _native_hash_ints(keys) is None
+    assert table._hash_values(keys) == [table._hash_value(key) for key in keys]
+
+
+@pytest.mark.parametrize('storage', ['chaining', 'open_addressing'])
+@pytest.mark.parametrize('capacity, max_load_factor', [(None, 0.75), (1, 0.75), (4, 0.75), (10, 0.9), (3, 0.99)])
+def test_reads_between_writes(storage, capacity, max_load_factor):
+    # Old array may be completely full while resizing is in progress.
+    random.seed(0)
+    table, expected = HashTable((), capacity, max_load_factor, storage=storage), {}
+    for _ in range(300):
+        key = random.randrange(60)
+        if random.random() < 0.3 and key in expected:
+            assert table.pop(key) == expected.pop(key)
+        else:
+            table[key] = expected[key] = random.random()
+
+        for read_key in range(-1, 61):
+            assert table.get(read_key) == expected.get(read_key)
+            assert (read_key in table) == (read_key in expected)